@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Build the Agentic Issues CLI as a single zipapp archive.
+
+The archive bundles the agentic_issues package so the CLI loads from one zip
+file instead of looking up each module on the filesystem, which shortens
+cold starts of `ag issues`.
+
+zipimport never writes bytecode caches, so each module is also stored
+precompiled as an unchecked hash-based .pyc next to its source. Interpreters
+with a different bytecode version ignore those and compile the sources.
+"""
+
+import argparse
+import py_compile
+import shutil
+import sys
+import tempfile
+import zipapp
+from pathlib import Path
+
+# Directory containing the agentic_issues package
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+
+def _include(path):
+    """Only bundle the agentic_issues package sources and bytecode."""
+    return path.parts[0] == "agentic_issues" and "__pycache__" not in path.parts
+
+
+def _stage_package(staging_dir):
+    """
+    Copy the package into staging_dir and compile each module next to its source.
+    
+    zipimport looks for module.pyc beside module.py rather than in __pycache__,
+    and only uses it without comparing timestamps when it is hash-based and
+    unchecked.
+    """
+    package_dir = staging_dir / "agentic_issues"
+    shutil.copytree(SRC_DIR / "agentic_issues", package_dir,
+                    ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+    for source in sorted(package_dir.glob("*.py")):
+        py_compile.compile(
+            str(source),
+            cfile=str(source.with_suffix(".pyc")),
+            dfile=source.relative_to(staging_dir).as_posix(),
+            doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+
+
+def main():
+    """Build the zipapp archive."""
+    parser = argparse.ArgumentParser(description="Build the Agentic Issues CLI as a .pyz archive")
+    parser.add_argument("--output", default=str(SRC_DIR.parent / "dist" / "agentic_issues.pyz"),
+                        help="Path of the archive to create (default: dist/agentic_issues.pyz)")
+    args = parser.parse_args()
+    
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    
+    with tempfile.TemporaryDirectory() as staging_dir:
+        staging_dir = Path(staging_dir)
+        _stage_package(staging_dir)
+        zipapp.create_archive(
+            staging_dir,
+            target=output,
+            interpreter="/usr/bin/env python3",
+            main="agentic_issues.ag_dispatch:main",
+            filter=_include,
+            compressed=True,
+        )
+    
+    print(f"Created {output}")
+    print("Run it directly or install it with:")
+    print(f"  python scripts/install_ag_issues.py --pyz {output}")
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,16 +13,18 @@ from pathlib import Path
 # Add the src directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-try:
-    from agentic_issues.models import Issue, IssuePriority
-    from agentic_issues.storage import default_storage
-except ImportError:
-    print("Error: Could not import the agentic_issues package.")
-    print("Please make sure the package is installed by running:")
-    print("  cd ~/Agentic/projects/agentic-issues")
-    print("  source .venv/bin/activate")
-    print("  uv pip install -e .")
-    sys.exit(1)
+# Accepted --priority values; each maps to an IssuePriority member by name
+PRIORITY_CHOICES = ("low", "medium", "high", "critical")
+
+def _positive_int(value):
+    """Parse a --count value, which must be at least 1."""
+    try:
+        count = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid count: {value!r}")
+    if count < 1:
+        raise argparse.ArgumentTypeError(f"count must be at least 1, got {count}")
+    return count
 
 def main():
     """Create a test issue."""
@@ -34,42 +36,55 @@ def main():
     parser.add_argument("--description", default="This is a test issue created by the create_test_issue.py script.",
                         help="Issue description")
     parser.add_argument("--priority", default="medium",
-                        choices=["low", "medium", "high", "critical"],
+                        choices=PRIORITY_CHOICES,
                         help="Issue priority (default: medium)")
-    parser.add_argument("--author", default=os.environ.get("USER", "test-user"),
-                        help="Issue author (default: current user)")
+    parser.add_argument("--author", default=None,
+                        help="Issue author (default: $USER)")
+    parser.add_argument("--count", type=_positive_int, default=1,
+                        help="Number of test issues to create (default: 1)")
     args = parser.parse_args()
+    author = args.author or os.environ.get("USER", "test-user")
+    
+    # The storage layer is imported only after the arguments have been parsed
+    try:
+        from agentic_issues.models import Issue, IssuePriority
+        from agentic_issues.storage import default_storage
+    except ImportError:
+        print("Error: Could not import the agentic_issues package.")
+        print("Please make sure the package is installed by running:")
+        print("  cd ~/Agentic/projects/agentic-issues")
+        print("  source .venv/bin/activate")
+        print("  uv pip install -e .")
+        return 1
     
-    # Parse priority
-    priority_map = {
-        "low": IssuePriority.LOW,
-        "medium": IssuePriority.MEDIUM,
-        "high": IssuePriority.HIGH,
-        "critical": IssuePriority.CRITICAL,
-    }
-    priority = priority_map.get(args.priority, IssuePriority.MEDIUM)
+    # Parse priority (already validated by argparse choices)
+    priority = IssuePriority[args.priority.upper()]
     
-    # Create the issue
-    issue = Issue.create(
-        project_id=args.project,
-        title=args.title,
-        description=args.description,
-        author=args.author,
-        priority=priority,
-        labels=["test"],
-    )
+    # Create the issues
+    issues = [
+        Issue.create(
+            project_id=args.project,
+            title=args.title,
+            description=args.description,
+            author=author,
+            priority=priority,
+            labels=["test"],
+        )
+        for _ in range(args.count)
+    ]
     
-    # Save the issue
-    default_storage.save_issue(issue)
+    # Save all issues with a single write of the project file
+    default_storage.save_issues(issues)
     
-    print(f"Created test issue with ID: {issue.id}")
+    for issue in issues:
+        print(f"Created test issue with ID: {issue.id}")
     print(f"Project: {args.project}")
     print(f"Title: {args.title}")
     print(f"Priority: {args.priority}")
-    print(f"Author: {args.author}")
+    print(f"Author: {author}")
     print(f"Labels: test")
     print(f"\nYou can view this issue by running:")
-    print(f"  ag issues show {issue.id} --project {args.project}")
+    print(f"  ag issues show {issues[-1].id} --project {args.project}")
     
     return 0
 
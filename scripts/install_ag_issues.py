@@ -6,191 +6,319 @@ This script installs the Agentic Issues system into the Agentic framework,
 allowing the `ag issue` command to be used from anywhere.
 """
 
+import io
 import os
+import ast
 import sys
 import shutil
 import argparse
+import py_compile
 import subprocess
 from pathlib import Path
 
-def main():
-    """Install the Agentic Issues system into the Agentic framework."""
-    parser = argparse.ArgumentParser(description="Install the Agentic Issues system")
-    parser.add_argument("--agentic-dir", default=os.path.expanduser("~/Agentic"),
-                        help="Path to the Agentic directory")
-    args = parser.parse_args()
+# Source of the {cmd}_command.py shim written to the Agentic scripts directory
+COMMAND_TEMPLATE = """#!/usr/bin/env python3
+import sys
+from agentic_issues.ag_dispatch import {cmd}_command
+
+if __name__ == "__main__":
+    sys.exit({cmd}_command(sys.argv[1:]))
+"""
+
+# Source of the {cmd}_command.py shim that loads the package from a zipapp
+# archive copied next to it
+PYZ_COMMAND_TEMPLATE = """#!/usr/bin/env python3
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "{archive}"))
+from agentic_issues.ag_dispatch import {cmd}_command
+
+if __name__ == "__main__":
+    sys.exit({cmd}_command(sys.argv[1:]))
+"""
+
+# Encoded source of the default issue_command.py script
+ISSUE_COMMAND_SOURCE = COMMAND_TEMPLATE.format(cmd="issue").encode("utf-8")
+
+# Entry inserted into the COMMAND_STRUCTURE dictionary of the ag script
+COMMAND_DEF_TEMPLATE = """    "{cmd}": {{
+        "description": "Issue tracking commands",
+        "subcommands": {{
+            "submit": {{
+                "description": "Submit a new issue",
+                "module": "{cmd}_command",
+                "function": "{cmd}_command"
+            }},
+            "list": {{
+                "description": "List issues",
+                "module": "{cmd}_command",
+                "function": "{cmd}_command"
+            }},
+            "show": {{
+                "description": "Show issue details",
+                "module": "{cmd}_command",
+                "function": "{cmd}_command"
+            }},
+            "comment": {{
+                "description": "Add a comment to an issue",
+                "module": "{cmd}_command",
+                "function": "{cmd}_command"
+            }},
+            "update": {{
+                "description": "Update an issue",
+                "module": "{cmd}_command",
+                "function": "{cmd}_command"
+            }}
+        }}
+    }},"""
+
+
+def _source_index(lines, lineno, col_offset):
+    """Convert an ast (lineno, UTF-8 byte col_offset) position to a string index."""
+    line = lines[lineno - 1]
+    column = len(line.encode("utf-8")[:col_offset].decode("utf-8"))
+    return sum(len(l) for l in lines[:lineno - 1]) + column
+
+
+def find_command_structure(ag_script):
+    """
+    Find where a new entry goes in the COMMAND_STRUCTURE dictionary of the ag script.
     
-    # Get the path to the Agentic framework
-    agentic_dir = Path(args.agentic_dir)
-    agentic_scripts_dir = agentic_dir / "agentic" / "scripts"
+    The script is parsed rather than scanned, so nested command dictionaries,
+    braces inside strings and comments are handled.
     
+    Args:
+        ag_script: Source of the ag script.
+    
+    Returns:
+        tuple: (end, last, commands) where end is the index of the dictionary's
+        closing brace, last is the index just past its last value (None if it
+        is empty) and commands is the set of its string keys, or None if the
+        script has no top-level COMMAND_STRUCTURE dictionary or does not parse.
+    """
+    try:
+        tree = ast.parse(ag_script)
+    except SyntaxError:
+        return None
+    
+    # Split on the same line endings as the parser; str.splitlines() would also
+    # split on form feeds and other separators and shift the offsets
+    lines = io.StringIO(ag_script, newline="").readlines()
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and isinstance(node.value, ast.Dict)
+                and any(isinstance(t, ast.Name) and t.id == "COMMAND_STRUCTURE" for t in node.targets)):
+            command_structure = node.value
+            end = _source_index(lines, command_structure.end_lineno, command_structure.end_col_offset) - 1
+            last = None
+            if command_structure.values:
+                value = command_structure.values[-1]
+                last = _source_index(lines, value.end_lineno, value.end_col_offset)
+            commands = {key.value for key in command_structure.keys
+                        if isinstance(key, ast.Constant) and isinstance(key.value, str)}
+            return end, last, commands
+    return None
+
+
+def install(cmd, agentic_dir, patch_ag=False, pyz=None):
+    """
+    Install the `ag <cmd>` command into the Agentic framework.
+
+    The package registers its commands in the "agentic.commands" entry point
+    group, which the `ag` dispatcher discovers at startup, so installing the
+    package is all that is normally needed.
+
+    Args:
+        cmd: Name of the ag subcommand to install (e.g. "issue").
+        agentic_dir: Path to the Agentic directory.
+        patch_ag: Also write the command script and register it in the ag
+            script, for ag versions without entry point discovery.
+        pyz: Optional zipapp archive built by build_pyz.py; implies patch_ag
+            and makes the command script load the package from the archive.
+
+    Returns:
+        int: Exit code.
+    """
     # Check if the Agentic framework exists
     if not agentic_dir.exists():
         print(f"Error: Agentic directory not found at {agentic_dir}")
         return 1
-    
-    if not agentic_scripts_dir.exists():
-        print(f"Error: Agentic scripts directory not found at {agentic_scripts_dir}")
-        return 1
-    
+
     # Get the path to this project
     project_dir = Path(__file__).parent.parent
-    
+
     # Install the package in development mode
     print(f"Installing the Agentic Issues package...")
-    try:
-        # Try using uv first
-        uv_result = subprocess.run(["uv", "pip", "install", "-e", str(project_dir)],
-                                  check=False, capture_output=True)
-        
-        if uv_result.returncode == 0:
-            print("Package installed successfully using uv")
+
+    # Use uv when it is on the PATH, otherwise go straight to pip. Output is
+    # streamed to the terminal rather than captured.
+    pip_args = ["install", "-e", str(project_dir)]
+    uv = shutil.which("uv")
+    if uv:
+        installer = "uv"
+        # Precompile bytecode so the first `ag` invocation imports .pyc files
+        returncode = subprocess.run([uv, "pip"] + pip_args + ["--compile-bytecode"]).returncode
+    else:
+        installer = "pip"
+        try:
+            # Run pip in this interpreter instead of starting a second one
+            from pip._internal.cli.main import main as pip_main
+        except ImportError:
+            returncode = subprocess.run([sys.executable, "-m", "pip"] + pip_args).returncode
         else:
-            # Fall back to pip if uv fails
-            pip_result = subprocess.run([sys.executable, "-m", "pip", "install", "-e", str(project_dir)],
-                                      check=True, capture_output=True)
-            print("Package installed successfully using pip")
-    except subprocess.CalledProcessError as e:
-        print(f"Error installing package: {e.stderr.decode() if hasattr(e.stderr, 'decode') else e.stderr}")
-        return 1
-    except FileNotFoundError:
-        print("Error: Neither uv nor pip is available. Please install one of them.")
+            returncode = pip_main(pip_args)
+
+    if returncode != 0:
+        print(f"Error installing package: {installer} exited with status {returncode}")
         return 1
-    
-    # Create the issue_command.py script in the Agentic scripts directory
-    issue_command_path = agentic_scripts_dir / "issue_command.py"
-    
-    print(f"Creating issue_command.py script at {issue_command_path}...")
-    
-    with open(issue_command_path, "w") as f:
-        f.write("""#!/usr/bin/env python3
-\"\"\"
-Issue command for the Agentic framework.
+    print(f"Package installed successfully using {installer}")
 
-This script provides the `ag issue` command for the Agentic framework.
-\"\"\"
+    if patch_ag or pyz:
+        result = patch_ag_script(cmd, agentic_dir, pyz=pyz)
+        if result != 0:
+            return result
 
-import sys
-import importlib.util
-import subprocess
+    print("\nInstallation complete!")
+    if patch_ag or pyz:
+        print(f"You can now use the `ag {cmd}` command from anywhere.")
+    else:
+        # Nothing was registered in the ag script, so the command only works
+        # with an ag that discovers the package's entry points
+        print(f"The `ag {cmd}` command is available if your ag script discovers commands")
+        print("through the \"agentic.commands\" entry point group. If it dispatches through")
+        print("its COMMAND_STRUCTURE dictionary instead, run this script again with --patch-ag.")
+    print("For example, try running:")
+    print(f"  ag {cmd} list")
+
+    return 0
+
+
+def patch_ag_script(cmd, agentic_dir, pyz=None):
+    """
+    Register the `ag <cmd>` command directly in the ag script.
+
+    Writes <cmd>_command.py to the Agentic scripts directory and adds an entry
+    for it to the COMMAND_STRUCTURE dictionary of the ag script.
 
-def issue_command(args):
-    \"\"\"
-    Handle the `ag issue` command.
-    
     Args:
-        args: Command-line arguments passed to the `ag issue` command.
-    
+        cmd: Name of the ag subcommand to install (e.g. "issue").
+        agentic_dir: Path to the Agentic directory.
+        pyz: Optional zipapp archive to copy next to the command script and
+            load the package from.
+
     Returns:
         int: Exit code.
-    \"\"\"
+    """
+    agentic_scripts_dir = agentic_dir / "agentic" / "scripts"
+    ag_script_path = agentic_dir / "agentic" / "ag"
+
+    # Read the framework directory once instead of stat()ing each path
     try:
-        # Try to import the agentic_issues package
-        import agentic_issues.ag_issues
-        return agentic_issues.ag_issues.issue_command(args)
-    except ImportError:
-        # If the package is not installed, suggest installing it
-        print("Error: The Agentic Issues package is not installed.")
-        print("Please install it by running:")
-        print("  cd ~/Agentic/projects/agentic-issues")
-        print("  source .venv/bin/activate")
-        print("  uv pip install -e .")
+        with os.scandir(agentic_dir / "agentic") as it:
+            entries = {entry.name: entry for entry in it}
+    except (FileNotFoundError, NotADirectoryError):
+        entries = {}
+
+    if "scripts" not in entries or not entries["scripts"].is_dir():
+        print(f"Error: Agentic scripts directory not found at {agentic_scripts_dir}")
         return 1
 
-if __name__ == "__main__":
-    sys.exit(issue_command(sys.argv[1:]))
-""")
-    
-    # Make the script executable
-    os.chmod(issue_command_path, 0o755)
-    
-    # Update the ag script to include the issue command
-    ag_script_path = agentic_dir / "agentic" / "ag"
-    
-    if not ag_script_path.exists():
+    # Create the command script in the Agentic scripts directory
+    command_path = agentic_scripts_dir / f"{cmd}_command.py"
+
+    print(f"Creating {command_path.name} script at {command_path}...")
+
+    if pyz:
+        archive_path = agentic_scripts_dir / pyz.name
+        print(f"Copying {pyz} to {archive_path}...")
+        shutil.copyfile(pyz, archive_path)
+        payload = PYZ_COMMAND_TEMPLATE.format(cmd=cmd, archive=pyz.name).encode("utf-8")
+    elif cmd == "issue":
+        payload = ISSUE_COMMAND_SOURCE
+    else:
+        payload = COMMAND_TEMPLATE.format(cmd=cmd).encode("utf-8")
+
+    # Write the script in one call, creating it executable
+    fd = os.open(command_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+    try:
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
+
+    # Compile it now so the first `ag` invocation does not have to. The .pyc
+    # goes to __pycache__, where the import system looks for it.
+    try:
+        py_compile.compile(str(command_path), doraise=True)
+    except py_compile.PyCompileError as e:
+        print(f"Warning: Could not precompile {command_path.name}: {e.msg}")
+
+    # Update the ag script to include the command
+    if "ag" not in entries or not entries["ag"].is_file():
         print(f"Warning: ag script not found at {ag_script_path}")
-        print("You will need to manually update the ag script to include the issue command")
+        print(f"You will need to manually update the ag script to include the {cmd} command")
     else:
-        print(f"Checking if the issue command is already in the ag script...")
-        
+        print(f"Checking if the {cmd} command is already in the ag script...")
+
         # Read the ag script
         with open(ag_script_path, "r") as f:
             ag_script = f.read()
-        
-        # Check if the issue command is already in the script
-        if '"issue"' in ag_script and "issue_command" in ag_script:
-            print("The issue command is already in the ag script")
+
+        # Find the COMMAND_STRUCTURE dictionary in the ag script
+        command_structure = find_command_structure(ag_script)
+        if command_structure is None:
+            print("Error: Could not find COMMAND_STRUCTURE in the ag script")
+            return 1
+        command_structure_end, last_value_end, commands = command_structure
+
+        # Check if the command is already in the script
+        if cmd in commands:
+            print(f"The {cmd} command is already in the ag script")
         else:
-            print("Adding the issue command to the ag script...")
-            
-            # Create a backup of the ag script
+            print(f"Adding the {cmd} command to the ag script...")
+
+            # The existing last entry needs a comma after it unless it has one
+            head = ag_script[:command_structure_end]
+            if last_value_end is not None and "," not in ag_script[last_value_end:command_structure_end].split("#")[0]:
+                head = ag_script[:last_value_end] + "," + ag_script[last_value_end:command_structure_end]
+
+            # Write the updated ag script to a sibling file in pieces, inserting
+            # the command definition before the end of COMMAND_STRUCTURE
+            tmp_path = ag_script_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                f.write(head.rstrip(" "))
+                if not head.endswith("\n"):
+                    f.write("\n")
+                f.write(COMMAND_DEF_TEMPLATE.format(cmd=cmd))
+                f.write("\n")
+                f.write(ag_script[command_structure_end:])
+            shutil.copymode(ag_script_path, tmp_path)
+
+            # Copy the original to the backup, then swap the new script in with
+            # a single rename so the ag script is never missing
             backup_path = ag_script_path.with_suffix(".bak")
             shutil.copy2(ag_script_path, backup_path)
             print(f"Created backup of ag script at {backup_path}")
-            
-            # Find the COMMAND_STRUCTURE dictionary in the ag script
-            command_structure_start = ag_script.find("COMMAND_STRUCTURE = {")
-            if command_structure_start == -1:
-                print("Error: Could not find COMMAND_STRUCTURE in the ag script")
-                return 1
-            
-            # Find the end of the COMMAND_STRUCTURE dictionary
-            command_structure_end = ag_script.find("}", command_structure_start)
-            if command_structure_end == -1:
-                print("Error: Could not find the end of COMMAND_STRUCTURE in the ag script")
-                return 1
-            
-            # Insert the issue command into the COMMAND_STRUCTURE dictionary
-            issue_command_def = """    "issue": {
-        "description": "Issue tracking commands",
-        "subcommands": {
-            "submit": {
-                "description": "Submit a new issue",
-                "module": "issue_command",
-                "function": "issue_command"
-            },
-            "list": {
-                "description": "List issues",
-                "module": "issue_command",
-                "function": "issue_command"
-            },
-            "show": {
-                "description": "Show issue details",
-                "module": "issue_command",
-                "function": "issue_command"
-            },
-            "comment": {
-                "description": "Add a comment to an issue",
-                "module": "issue_command",
-                "function": "issue_command"
-            },
-            "update": {
-                "description": "Update an issue",
-                "module": "issue_command",
-                "function": "issue_command"
-            }
-        }
-    },"""
-            
-            # Insert the issue command definition before the end of the COMMAND_STRUCTURE dictionary
-            new_ag_script = (
-                ag_script[:command_structure_end] +
-                issue_command_def +
-                ag_script[command_structure_end:]
-            )
-            
-            # Write the updated ag script
-            with open(ag_script_path, "w") as f:
-                f.write(new_ag_script)
-            
-            print("Updated the ag script to include the issue command")
-    
-    print("\nInstallation complete!")
-    print("You can now use the `ag issue` command from anywhere.")
-    print("For example, try running:")
-    print("  ag issue list")
-    
+            os.replace(tmp_path, ag_script_path)
+
+            print(f"Updated the ag script to include the {cmd} command")
+
     return 0
 
+
+def main():
+    """Install the Agentic Issues system into the Agentic framework."""
+    parser = argparse.ArgumentParser(description="Install the Agentic Issues system")
+    parser.add_argument("--agentic-dir", default=os.path.expanduser("~/Agentic"),
+                        help="Path to the Agentic directory")
+    parser.add_argument("--patch-ag", action="store_true",
+                        help="Also register the command in the ag script's COMMAND_STRUCTURE "
+                             "(for ag versions without entry point discovery)")
+    parser.add_argument("--pyz",
+                        help="Zipapp archive built by build_pyz.py to load the command from "
+                             "(implies --patch-ag)")
+    args = parser.parse_args()
+
+    pyz = Path(args.pyz) if args.pyz else None
+    return install("issue", Path(args.agentic_dir), patch_ag=args.patch_ag, pyz=pyz)
+
 if __name__ == "__main__":
     sys.exit(main())
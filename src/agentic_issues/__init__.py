@@ -4,4 +4,22 @@ Agentic Issues - A system for managing issues and tickets for Agentic projects.
 
 __version__ = "0.1.0"
 
-# Do not import any modules to avoid circular import issues
+# Submodules are resolved lazily through __getattr__ (PEP 562) so that importing
+# the package stays cheap and circular imports are avoided.
+__all__ = ["models", "storage", "cli"]
+
+
+def __getattr__(name):
+    """Import public submodules on first attribute access."""
+    if name in __all__:
+        import importlib
+
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """Include lazily loaded submodules in dir() for tab completion."""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,41 @@
+"""
+Dispatch functions for the Agentic framework's `ag` command scripts.
+
+The command scripts written by `install_ag_issues.py --patch-ag` are thin shims
+that import these functions, so the command logic ships with the package
+rather than being duplicated into every generated script.
+"""
+
+
+def issue_command(args=None):
+    """
+    Handle the `ag issue` command.
+    
+    Args:
+        args: Command-line arguments passed to the `ag issue` command.
+    
+    Returns:
+        int: Exit code.
+    """
+    from agentic_issues.ag_issues import issue_command as run
+    return run(args)
+
+
+def issues_command(args=None):
+    """
+    Handle the `ag issues` command.
+    
+    Args:
+        args: Command-line arguments passed to the `ag issues` command.
+    
+    Returns:
+        int: Exit code.
+    """
+    from agentic_issues.ag_issues import issues_command as run
+    return run(args)
+
+
+def main():
+    """Run the `ag issues` command with the process arguments and exit."""
+    import sys
+    sys.exit(issues_command(sys.argv[1:]))
@@ -10,297 +10,325 @@ import sys
 import os
 import argparse
 import datetime
+import functools
+import re
 from pathlib import Path
 
-from .storage import default_storage
-from .models import Issue, IssueStatus, IssuePriority
+# List markers, keyed by IssuePriority and IssueStatus value
+_PRIORITY_MARKER = {
+    "low": "⚪",
+    "medium": "🔵",
+    "high": "🔶",
+    "critical": "🔴",
+}
+
+_STATUS_MARKER = {
+    "open": "🆕",
+    "in_progress": "🔄",
+    "resolved": "✅",
+    "closed": "❌",
+}
+
+# Display format for timestamps
+_DT_FMT = "%Y-%m-%d %H:%M"
+
+# Separator of the comma-separated --labels argument, surrounding spaces included
+_LABEL_SPLIT = re.compile(r"\s*,\s*")
+
+# Author recorded on new issues and comments
+_CURRENT_USER = os.environ.get("USER") or "unknown"
+
+@functools.lru_cache(maxsize=1)
+def _dir_name(path):
+    """Get the name of a directory."""
+    return Path(path).name
 
 def get_project_id(args):
     """Get the project ID from the arguments or the current directory."""
-    if args.project:
-        return args.project
-    
-    # Default to the current directory name
-    return Path.cwd().name
+    # Default to the current directory name; the cache is keyed on the
+    # directory, so it follows a change of directory
+    return args.project or _dir_name(os.getcwd())
 
-def format_issue_list(issues, detailed=False):
-    """Format a list of issues for display."""
-    if not issues:
-        return "No issues found."
-    
-    result = []
-    for issue in issues:
-        if detailed:
-            result.append(f"ID: {issue.id}")
-            result.append(f"Title: {issue.title}")
-            result.append(f"Status: {issue.status.value}")
-            result.append(f"Priority: {issue.priority.value}")
-            result.append(f"Created: {issue.created_at.strftime('%Y-%m-%d %H:%M')}")
-            if issue.updated_at:
-                result.append(f"Updated: {issue.updated_at.strftime('%Y-%m-%d %H:%M')}")
-            else:
-                result.append("Updated: Not updated yet")
-            if issue.assignee:
-                result.append(f"Assignee: {issue.assignee}")
-            if issue.labels:
-                result.append(f"Labels: {', '.join(issue.labels)}")
-            result.append("")
-        else:
-            priority_marker = {
-                IssuePriority.LOW: "⚪",
-                IssuePriority.MEDIUM: "🔵",
-                IssuePriority.HIGH: "🔶",
-                IssuePriority.CRITICAL: "🔴"
-            }.get(issue.priority, "⚪")
-            
-            status_marker = {
-                IssueStatus.OPEN: "🆕",
-                IssueStatus.IN_PROGRESS: "🔄",
-                IssueStatus.RESOLVED: "✅",
-                IssueStatus.CLOSED: "❌"
-            }.get(issue.status, "🆕")
-            
-            result.append(f"{priority_marker} {status_marker} {issue.id}: {issue.title}")
-    
-    return "\n".join(result)
+def _fmt_dt(dt):
+    """Format a timestamp for display."""
+    if dt.tzinfo is None:
+        # Same text as strftime(_DT_FMT), but isoformat is much cheaper
+        return dt.isoformat(sep=" ", timespec="minutes")
+    return dt.strftime(_DT_FMT)
 
-def format_issue_detail(issue):
-    """Format a single issue for detailed display."""
-    result = [
-        f"ID: {issue.id}",
-        f"Title: {issue.title}",
-        f"Status: {issue.status.value}",
-        f"Priority: {issue.priority.value}",
-        f"Created: {issue.created_at.strftime('%Y-%m-%d %H:%M')}"
-    ]
-    
+def _format_issue_summary(issue):
+    """Format the header fields of an issue, one per line."""
     if issue.updated_at:
-        result.append(f"Updated: {issue.updated_at.strftime('%Y-%m-%d %H:%M')}")
+        updated = f"Updated: {_fmt_dt(issue.updated_at)}"
     else:
-        result.append("Updated: Not updated yet")
-    
-    if issue.assignee:
-        result.append(f"Assignee: {issue.assignee}")
-    
-    if issue.labels:
-        result.append(f"Labels: {', '.join(issue.labels)}")
-    
-    result.append("")
-    result.append("Description:")
-    result.append(issue.description)
+        updated = "Updated: Not updated yet"
+    assignee = f"\nAssignee: {issue.assignee}" if issue.assignee else ""
+    labels = f"\nLabels: {', '.join(issue.labels)}" if issue.labels else ""
     
-    if issue.comments:
-        result.append("")
-        result.append("Comments:")
-        for comment in issue.comments:
-            result.append(f"--- {comment.created_at.strftime('%Y-%m-%d %H:%M')} by {comment.author} ---")
-            result.append(comment.content)
-            result.append("")
-    
-    return "\n".join(result)
+    return (
+        f"ID: {issue.id}\n"
+        f"Title: {issue.title}\n"
+        f"Status: {issue.status.value}\n"
+        f"Priority: {issue.priority.value}\n"
+        f"Created: {_fmt_dt(issue.created_at)}\n"
+        f"{updated}{assignee}{labels}"
+    )
 
-def issue_command(args=None):
+def iter_issue_list(issues, detailed=False):
     """
-    Handle the `ag issue` command.
+    Format a list of issues for display, one entry at a time.
     
-    This function is called by the Agentic framework's `ag` script when
-    the user runs `ag issue`.
-    
-    Args:
-        args: Command-line arguments passed to the `ag issue` command.
+    Joining the entries with newlines gives the text of format_issue_list,
+    so callers can stream the entries instead of building the whole output.
+    """
+    if not issues:
+        yield "No issues found."
+    elif detailed:
+        for issue in issues:
+            yield f"{_format_issue_summary(issue)}\n"
+    else:
+        for issue in issues:
+            yield (f"{_PRIORITY_MARKER.get(issue.priority.value, '⚪')} "
+                   f"{_STATUS_MARKER.get(issue.status.value, '🆕')} {issue.id}: {issue.title}")
+
+def format_issue_list(issues, detailed=False):
+    """Format a list of issues for display."""
+    return "\n".join(iter_issue_list(issues, detailed))
+
+def iter_issue_detail(issue):
+    """
+    Format a single issue for detailed display, one section at a time.
     
-    Returns:
-        int: Exit code.
+    Joining the sections with newlines gives the text of format_issue_detail.
     """
-    parser = argparse.ArgumentParser(description="Agentic Issues - Issue tracking for Agentic projects")
-    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+    yield _format_issue_summary(issue)
+    yield f"\nDescription:\n{issue.description}"
     
-    # Submit command
+    if issue.comments:
+        yield "\nComments:"
+        for comment in issue.comments:
+            yield f"--- {_fmt_dt(comment.created_at)} by {comment.author} ---\n{comment.content}\n"
+
+def format_issue_detail(issue):
+    """Format a single issue for detailed display."""
+    return "\n".join(iter_issue_detail(issue))
+
+def _write_lines(lines):
+    """Write each line to stdout as it is produced."""
+    sys.stdout.writelines(f"{line}\n" for line in lines)
+
+def _status_type(value):
+    """Convert a --status argument to an IssueStatus."""
+    from .models import STATUS_BY_VALUE
+    status = STATUS_BY_VALUE.get(value)
+    if status is None:
+        raise argparse.ArgumentTypeError(
+            f"invalid status '{value}' (choose from {', '.join(STATUS_BY_VALUE)})")
+    return status
+
+def _priority_type(value):
+    """Convert a --priority argument to an IssuePriority."""
+    from .models import PRIORITY_BY_VALUE
+    priority = PRIORITY_BY_VALUE.get(value)
+    if priority is None:
+        raise argparse.ArgumentTypeError(
+            f"invalid priority '{value}' (choose from {', '.join(PRIORITY_BY_VALUE)})")
+    return priority
+
+def _add_submit_parser(subparsers):
+    """Add the submit command parser."""
     submit_parser = subparsers.add_parser("submit", help="Submit a new issue")
     submit_parser.add_argument("--project", help="Project ID (defaults to current directory)")
     submit_parser.add_argument("--title", help="Issue title")
     submit_parser.add_argument("--description", help="Issue description")
-    submit_parser.add_argument("--priority", help="Issue priority (low, medium, high, critical)")
+    submit_parser.add_argument("--priority", type=_priority_type,
+                               help="Issue priority (low, medium, high, critical)")
     submit_parser.add_argument("--labels", help="Comma-separated list of labels")
-    
-    # List command
+
+def _add_list_parser(subparsers):
+    """Add the list command parser."""
     list_parser = subparsers.add_parser("list", help="List issues")
     list_parser.add_argument("--project", help="Project ID (defaults to current directory)")
-    list_parser.add_argument("--status", help="Filter by status (open, in_progress, resolved, closed)")
-    list_parser.add_argument("--priority", help="Filter by priority (low, medium, high, critical)")
+    list_parser.add_argument("--status", type=_status_type,
+                             help="Filter by status (open, in_progress, resolved, closed)")
+    list_parser.add_argument("--priority", type=_priority_type,
+                             help="Filter by priority (low, medium, high, critical)")
     list_parser.add_argument("--label", help="Filter by label")
     list_parser.add_argument("--sort", choices=["priority", "created", "updated"], default="priority",
                             help="Sort order (default: priority)")
     list_parser.add_argument("--detailed", action="store_true", help="Show detailed information")
-    
-    # Show command
+
+def _add_show_parser(subparsers):
+    """Add the show command parser."""
     show_parser = subparsers.add_parser("show", help="Show issue details")
     show_parser.add_argument("issue_id", help="Issue ID")
     show_parser.add_argument("--project", help="Project ID (defaults to current directory)")
-    
-    # Comment command
+
+def _add_comment_parser(subparsers):
+    """Add the comment command parser."""
     comment_parser = subparsers.add_parser("comment", help="Add a comment to an issue")
     comment_parser.add_argument("issue_id", help="Issue ID")
     comment_parser.add_argument("--project", help="Project ID (defaults to current directory)")
     comment_parser.add_argument("--content", help="Comment content")
-    
-    # Update command
+
+def _add_update_parser(subparsers):
+    """Add the update command parser."""
     update_parser = subparsers.add_parser("update", help="Update an issue")
     update_parser.add_argument("issue_id", help="Issue ID")
     update_parser.add_argument("--project", help="Project ID (defaults to current directory)")
-    update_parser.add_argument("--status", help="New status (open, in_progress, resolved, closed)")
-    update_parser.add_argument("--priority", help="New priority (low, medium, high, critical)")
+    update_parser.add_argument("--status", type=_status_type,
+                               help="New status (open, in_progress, resolved, closed)")
+    update_parser.add_argument("--priority", type=_priority_type,
+                               help="New priority (low, medium, high, critical)")
     update_parser.add_argument("--assignee", help="Assign to user")
     update_parser.add_argument("--add-label", help="Add a label")
+
+# Subparser builders by command name, in the order shown in --help
+_SUBPARSER_BUILDERS = {
+    "submit": _add_submit_parser,
+    "list": _add_list_parser,
+    "show": _add_show_parser,
+    "comment": _add_comment_parser,
+    "update": _add_update_parser,
+}
+
+@functools.lru_cache(maxsize=None)
+def _build_parser(command=None):
+    """
+    Build the argument parser for the `ag issue` command.
     
-    parsed_args = parser.parse_args(args)
+    The grammar is static, so parsers are cached and reused by later calls.
     
-    if parsed_args.command is None:
-        parser.print_help()
-        return 1
+    Args:
+        command: If this names a known command, only its subparser is built;
+            otherwise (None) all are built.
     
-    # Handle the list command
-    if parsed_args.command == "list":
-        project_id = get_project_id(parsed_args)
-        issues = default_storage.get_issues(project_id)
-        
-        # Apply filters
-        if parsed_args.status:
-            try:
-                status = IssueStatus(parsed_args.status)
-                issues = [i for i in issues if i.status == status]
-            except ValueError:
-                print(f"Invalid status: {parsed_args.status}")
-                return 1
-        
-        if parsed_args.priority:
-            try:
-                priority = IssuePriority(parsed_args.priority)
-                issues = [i for i in issues if i.priority == priority]
-            except ValueError:
-                print(f"Invalid priority: {parsed_args.priority}")
-                return 1
-        
-        if parsed_args.label:
-            issues = [i for i in issues if parsed_args.label in (i.labels or [])]
-        
-        # Sort issues
-        if parsed_args.sort == "priority":
-            # Sort by priority (critical -> high -> medium -> low)
-            issues.sort(key=lambda i: i.priority.value, reverse=True)
-        elif parsed_args.sort == "created":
-            issues.sort(key=lambda i: i.created_at, reverse=True)
-        elif parsed_args.sort == "updated":
-            issues.sort(key=lambda i: i.updated_at, reverse=True)
-        
-        print(format_issue_list(issues, parsed_args.detailed))
-        return 0
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(description="Agentic Issues - Issue tracking for Agentic projects")
+    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
     
-    # Handle the show command
-    elif parsed_args.command == "show":
-        project_id = get_project_id(parsed_args)
-        issue = default_storage.get_issue(project_id, parsed_args.issue_id)
-        
-        if issue:
-            print(format_issue_detail(issue))
-            return 0
-        else:
-            print(f"Issue {parsed_args.issue_id} not found in project {project_id}")
-            return 1
+    if command in _SUBPARSER_BUILDERS:
+        _SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for add_parser in _SUBPARSER_BUILDERS.values():
+            add_parser(subparsers)
     
-    # Handle the submit command
-    elif parsed_args.command == "submit":
-        project_id = get_project_id(parsed_args)
-        
-        if not parsed_args.title:
-            print("Error: Title is required")
-            return 1
-        
-        description = parsed_args.description or "No description provided"
-        
-        # Parse priority
-        try:
-            priority = IssuePriority.MEDIUM  # Default priority
-            if parsed_args.priority:
-                priority = IssuePriority(parsed_args.priority)
-        except ValueError:
-            print(f"Invalid priority: {parsed_args.priority}")
-            print(f"Valid priorities are: {', '.join(p.value for p in IssuePriority)}")
-            return 1
-        
-        # Parse labels
-        labels = []
-        if parsed_args.labels:
-            labels = [label.strip() for label in parsed_args.labels.split(",") if label.strip()]
-        
-        # Create the issue
-        issue = Issue.create(
-            project_id=project_id,
-            title=parsed_args.title,
-            description=description,
-            author=os.environ.get("USER", "unknown"),
-            priority=priority,
-            labels=labels
-        )
-        
-        # Save the issue
-        default_storage.save_issue(issue)
-        
-        print(f"Issue created with ID: {issue.id}")
+    return parser
+
+def _run_list(parsed_args):
+    """Handle the list command."""
+    from .storage import default_storage
+    
+    project_id = get_project_id(parsed_args)
+    
+    # Let the storage apply the filters (already converted by the parser)
+    issues = default_storage.query_issues(
+        project_id,
+        status=parsed_args.status,
+        priority=parsed_args.priority,
+        label=parsed_args.label,
+        sort=parsed_args.sort,
+    )
+    
+    _write_lines(iter_issue_list(issues, parsed_args.detailed))
+    return 0
+
+def _run_show(parsed_args):
+    """Handle the show command."""
+    from .storage import default_storage
+    
+    project_id = get_project_id(parsed_args)
+    issue = default_storage.get_issue(project_id, parsed_args.issue_id)
+    
+    if issue:
+        _write_lines(iter_issue_detail(issue))
         return 0
+    else:
+        print(f"Issue {parsed_args.issue_id} not found in project {project_id}")
+        return 1
+
+def _run_submit(parsed_args):
+    """Handle the submit command."""
+    from .models import Issue, IssuePriority
+    from .storage import default_storage
     
-    # Handle the update command
-    elif parsed_args.command == "update":
-        project_id = get_project_id(parsed_args)
-        issue = default_storage.get_issue(project_id, parsed_args.issue_id)
-        
+    project_id = get_project_id(parsed_args)
+    
+    if not parsed_args.title:
+        print("Error: Title is required")
+        return 1
+    
+    description = parsed_args.description or "No description provided"
+    
+    # Priority (already converted by the parser)
+    priority = parsed_args.priority or IssuePriority.MEDIUM
+    
+    # Parse labels
+    labels = []
+    if parsed_args.labels:
+        raw_labels = parsed_args.labels.strip()
+        if raw_labels:
+            labels = [label for label in _LABEL_SPLIT.split(raw_labels) if label]
+    
+    # Create the issue
+    issue = Issue.create(
+        project_id=project_id,
+        title=parsed_args.title,
+        description=description,
+        author=_CURRENT_USER,
+        priority=priority,
+        labels=labels
+    )
+    
+    # Save the issue
+    default_storage.save_issue(issue)
+    
+    print(f"Issue created with ID: {issue.id}")
+    return 0
+
+def _run_update(parsed_args):
+    """Handle the update command."""
+    from .storage import default_storage
+    
+    project_id = get_project_id(parsed_args)
+    
+    with default_storage.mutate_issue(project_id, parsed_args.issue_id) as issue:
         if not issue:
             print(f"Issue {parsed_args.issue_id} not found in project {project_id}")
             return 1
         
-        # Update status if specified
-        if parsed_args.status:
-            try:
-                status = IssueStatus(parsed_args.status)
-                issue.update_status(status)
-                print(f"Status updated to {status.value}")
-            except ValueError:
-                print(f"Invalid status: {parsed_args.status}")
-                print(f"Valid statuses are: {', '.join(s.value for s in IssueStatus)}")
-                return 1
-        
-        # Update priority if specified
-        if parsed_args.priority:
-            try:
-                priority = IssuePriority(parsed_args.priority)
-                issue.update_priority(priority)
-                print(f"Priority updated to {priority.value}")
-            except ValueError:
-                print(f"Invalid priority: {parsed_args.priority}")
-                print(f"Valid priorities are: {', '.join(p.value for p in IssuePriority)}")
-                return 1
-        
-        # Update assignee if specified
-        if parsed_args.assignee:
-            issue.assign(parsed_args.assignee)
-            print(f"Assignee updated to {parsed_args.assignee}")
-        
-        # Add label if specified
-        if parsed_args.add_label:
-            issue.add_label(parsed_args.add_label)
-            print(f"Label '{parsed_args.add_label}' added")
-        
-        # Save the updated issue
-        default_storage.save_issue(issue)
-        
-        print(f"Issue {parsed_args.issue_id} updated successfully")
+        # Apply all requested changes at once; they are saved on exit if any
+        # field changed
+        changed = issue.apply_updates(
+            status=parsed_args.status,
+            priority=parsed_args.priority,
+            assignee=parsed_args.assignee or None,
+            label=parsed_args.add_label or None,
+        )
+    
+    if not changed:
+        print(f"No changes made to issue {parsed_args.issue_id}")
         return 0
+    if "status" in changed:
+        print(f"Status updated to {parsed_args.status.value}")
+    if "priority" in changed:
+        print(f"Priority updated to {parsed_args.priority.value}")
+    if "assignee" in changed:
+        print(f"Assignee updated to {parsed_args.assignee}")
+    if "labels" in changed:
+        print(f"Label '{parsed_args.add_label}' added")
+    print(f"Issue {parsed_args.issue_id} updated successfully")
+    return 0
+
+def _run_comment(parsed_args):
+    """Handle the comment command."""
+    from .storage import default_storage
     
-    # Handle the comment command
-    elif parsed_args.command == "comment":
-        project_id = get_project_id(parsed_args)
-        issue = default_storage.get_issue(project_id, parsed_args.issue_id)
-        
+    project_id = get_project_id(parsed_args)
+    
+    with default_storage.mutate_issue(project_id, parsed_args.issue_id) as issue:
         if not issue:
             print(f"Issue {parsed_args.issue_id} not found in project {project_id}")
             return 1
@@ -309,23 +337,77 @@ def issue_command(args=None):
             print("Error: Comment content is required")
             return 1
         
-        # Add the comment to the issue
-        author = os.environ.get("USER", "unknown")
-        comment = issue.add_comment(author, parsed_args.content)
-        
-        # Save the updated issue
-        default_storage.save_issue(issue)
-        
-        print(f"Comment added to issue {parsed_args.issue_id}")
-        return 0
-    
-    # For other commands, show a placeholder message
-    print(f"Agentic Issues - {parsed_args.command.capitalize()} command")
-    print("This functionality is not yet fully implemented.")
-    print(f"Arguments: {parsed_args}")
+        # Add the comment to the issue; it is saved on exit
+        issue.add_comment(_CURRENT_USER, parsed_args.content)
     
+    print(f"Comment added to issue {parsed_args.issue_id}")
     return 0
 
+# Command handlers by command name
+_COMMAND_HANDLERS = {
+    "submit": _run_submit,
+    "list": _run_list,
+    "show": _run_show,
+    "comment": _run_comment,
+    "update": _run_update,
+}
+
+@functools.lru_cache(maxsize=1)
+def _help_text():
+    """Get the help text of the `ag issue` command."""
+    return _build_parser().format_help()
+
+def issue_command(args=None):
+    """
+    Handle the `ag issue` command.
+    
+    This function is called by the Agentic framework's `ag` script when
+    the user runs `ag issue`.
+    
+    Args:
+        args: Command-line arguments passed to the `ag issue` command.
+    
+    Returns:
+        int: Exit code.
+    """
+    if args is None:
+        args = sys.argv[1:]
+    
+    # Print the help without parsing anything when that is all there is to do
+    if not args or args[0] in ("-h", "--help"):
+        sys.stdout.write(_help_text())
+        return 1 if not args else 0
+    
+    # Only the subparser for the requested command is needed to parse it;
+    # no command, --help and unknown commands need all of them
+    command = args[0] if args and args[0] in _SUBPARSER_BUILDERS else None
+    parser = _build_parser(command)
+    
+    parsed_args = parser.parse_args(args)
+    
+    if parsed_args.command is None:
+        parser.print_help()
+        return 1
+    
+    # Every command with a parser has a handler
+    return _COMMAND_HANDLERS[parsed_args.command](parsed_args)
+
+
+def issues_command(args=None):
+    """
+    Handle the `ag issues` command.
+    
+    This is the entry point registered in the "agentic.commands" group and
+    as the `ag-issues` console script; it behaves exactly like `ag issue`.
+    
+    Args:
+        args: Command-line arguments passed to the `ag issues` command.
+    
+    Returns:
+        int: Exit code.
+    """
+    return issue_command(args)
+
 
 if __name__ == "__main__":
     # When run directly, pass all command-line arguments to the issue_command function
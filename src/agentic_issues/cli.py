@@ -5,14 +5,54 @@ This module provides the CLI interface for the `ag issue` command.
 """
 
 import argparse
-import datetime
-import getpass
+import functools
 import os
 import sys
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from agentic_issues.models import Issue, IssuePriority, IssueStatus
-from agentic_issues.storage import default_storage
+# Issue is only needed for annotations; the commands import models and storage
+# themselves (see "Lazy imports" in docs/DIRECTORY_STRUCTURE.md)
+if TYPE_CHECKING:
+    from agentic_issues.models import Issue
+
+
+# ANSI colors of the statuses, keyed by IssueStatus value
+_STATUS_COLORS = {
+    "open": "\033[92m",  # Green
+    "in_progress": "\033[93m",  # Yellow
+    "resolved": "\033[94m",  # Blue
+    "closed": "\033[90m",  # Gray
+}
+
+_PRIORITY_MARKERS = {
+    "low": "⬇️",
+    "medium": "⏺️",
+    "high": "⬆️",
+    "critical": "🔴",
+}
+
+_RESET = "\033[0m"
+
+# Colors are only used when writing to a terminal, unless NO_COLOR is set
+_USE_COLOR = sys.stdout.isatty() and not os.environ.get("NO_COLOR")
+
+# Status text as displayed, colored once here rather than for every issue
+if _USE_COLOR:
+    _STATUS_LABELS = {status: f"{color}{status}{_RESET}" for status, color in _STATUS_COLORS.items()}
+else:
+    _STATUS_LABELS = {status: status for status in _STATUS_COLORS}
+
+# Display format for timestamps
+_DT_FMT = "%Y-%m-%d %H:%M"
+
+# Directory containing the Agentic projects, with a trailing separator
+_PROJECTS_DIR = os.path.join(os.path.expanduser("~/Agentic/projects"), "")
+
+
+def _get_storage():
+    """Get the default issue storage, importing it on first use."""
+    from agentic_issues.storage import default_storage
+    return default_storage
 
 
 def get_current_project_id() -> Optional[str]:
@@ -23,72 +63,83 @@ def get_current_project_id() -> Optional[str]:
     current working directory. If the current directory is within a project
     directory, it returns the project ID.
     """
-    cwd = os.getcwd()
-    projects_dir = os.path.expanduser("~/Agentic/projects")
-    
+    return _project_id_for(os.getcwd())
+
+
+@functools.lru_cache(maxsize=1)
+def _project_id_for(cwd: str) -> Optional[str]:
+    """Get the ID of the project containing a directory, or None."""
     # Check if we're in a project directory
-    if cwd.startswith(projects_dir):
-        # Extract the project name from the path
-        rel_path = os.path.relpath(cwd, projects_dir)
-        project_name = rel_path.split(os.path.sep)[0]
-        return project_name
+    if cwd.startswith(_PROJECTS_DIR):
+        # The project name is the first path component below the projects directory
+        return cwd[len(_PROJECTS_DIR):].split(os.sep, 1)[0]
     
     # If we're not in a project directory, return None
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def get_current_user() -> str:
-    """Get the current user's username."""
+    """
+    Get the current user's username.
+    
+    The user cannot change within a process, so the result is cached.
+    """
+    import getpass
     return getpass.getuser()
 
 
-def format_issue(issue: Issue, detailed: bool = False) -> str:
+def _read_until_eof() -> str:
+    """Read text from standard input until EOF, without the final newline."""
+    text = sys.stdin.read()
+    return text[:-1] if text.endswith("\n") else text
+
+
+def _format_issue_summary(issue: "Issue") -> str:
+    """Format the one-line summary of an issue: ID, status, priority, title."""
+    status = issue.status.value
+    status_label = _STATUS_LABELS.get(status, status)
+    priority_marker = _PRIORITY_MARKERS.get(issue.priority.value, "")
+    return f"{issue.id[:8]} {status_label} {priority_marker} {issue.title}"
+
+
+def _format_issue_detailed(issue: "Issue") -> str:
+    """Format the summary of an issue followed by all its details."""
+    created = issue.created_at.strftime(_DT_FMT) if issue.created_at else "N/A"
+    parts = [
+        _format_issue_summary(issue),
+        f"\n\nDescription:\n{issue.description}\n\nAuthor: {issue.author}",
+    ]
+    if issue.assignee:
+        parts.append(f" | Assignee: {issue.assignee}")
+    parts.append(f" | Created: {created}")
+    if issue.updated_at:
+        parts.append(f" | Updated: {issue.updated_at.strftime(_DT_FMT)}")
+    
+    if issue.labels:
+        parts.append(f"\nLabels: {', '.join(issue.labels)}")
+    
+    if issue.comments:
+        parts.append("\n\nComments:\n")
+        for i, comment in enumerate(issue.comments, 1):
+            commented = comment.created_at.strftime(_DT_FMT) if comment.created_at else "N/A"
+            parts.extend((
+                f"\n{i}. {comment.author} ({commented}):\n",
+                f"   {comment.content}\n",
+            ))
+    
+    return "".join(parts)
+
+
+def format_issue(issue: "Issue", detailed: bool = False) -> str:
     """Format an issue for display."""
-    status_colors = {
-        IssueStatus.OPEN: "\033[92m",  # Green
-        IssueStatus.IN_PROGRESS: "\033[93m",  # Yellow
-        IssueStatus.RESOLVED: "\033[94m",  # Blue
-        IssueStatus.CLOSED: "\033[90m",  # Gray
-    }
-    
-    priority_markers = {
-        IssuePriority.LOW: "⬇️",
-        IssuePriority.MEDIUM: "⏺️",
-        IssuePriority.HIGH: "⬆️",
-        IssuePriority.CRITICAL: "🔴",
-    }
-    
-    reset = "\033[0m"
-    status_color = status_colors.get(issue.status, "")
-    priority_marker = priority_markers.get(issue.priority, "")
-    
-    # Basic format: ID, status, priority, title
-    result = f"{issue.id[:8]} {status_color}{issue.status.value}{reset} {priority_marker} {issue.title}"
-    
-    if detailed:
-        # Add more details for detailed view
-        result += f"\n\nDescription:\n{issue.description}\n"
-        result += f"\nAuthor: {issue.author}"
-        if issue.assignee:
-            result += f" | Assignee: {issue.assignee}"
-        result += f" | Created: {issue.created_at.strftime('%Y-%m-%d %H:%M') if issue.created_at else 'N/A'}"
-        if issue.updated_at:
-            result += f" | Updated: {issue.updated_at.strftime('%Y-%m-%d %H:%M') if issue.updated_at else 'N/A'}"
-        
-        if issue.labels:
-            result += f"\nLabels: {', '.join(issue.labels)}"
-        
-        if issue.comments:
-            result += "\n\nComments:\n"
-            for i, comment in enumerate(issue.comments, 1):
-                result += f"\n{i}. {comment.author} ({comment.created_at.strftime('%Y-%m-%d %H:%M') if comment.created_at else 'N/A'}):\n"
-                result += f"   {comment.content}\n"
-    
-    return result
+    return _format_issue_detailed(issue) if detailed else _format_issue_summary(issue)
 
 
 def cmd_submit(args: argparse.Namespace) -> int:
     """Submit a new issue."""
+    from agentic_issues.models import PRIORITY_BY_VALUE, Issue, IssuePriority
+    
     project_id = args.project or get_current_project_id()
     if not project_id:
         print("Error: Could not determine project ID. Please specify with --project.")
@@ -104,21 +155,15 @@ def cmd_submit(args: argparse.Namespace) -> int:
     if not description:
         # If no description is provided, prompt for one
         print("Please enter a description (press Ctrl+D or Ctrl+Z on a new line to finish):")
-        description_lines = []
-        try:
-            while True:
-                line = input()
-                description_lines.append(line)
-        except EOFError:
-            description = "\n".join(description_lines)
+        description = _read_until_eof()
     
     # Parse priority
     priority = IssuePriority.MEDIUM
     if args.priority:
-        try:
-            priority = IssuePriority(args.priority.lower())
-        except ValueError:
+        priority = PRIORITY_BY_VALUE.get(args.priority.lower())
+        if priority is None:
             print(f"Warning: Invalid priority '{args.priority}'. Using MEDIUM instead.")
+            priority = IssuePriority.MEDIUM
     
     # Parse labels
     labels = []
@@ -137,68 +182,50 @@ def cmd_submit(args: argparse.Namespace) -> int:
     )
     
     # Save the issue
-    default_storage.save_issue(issue)
+    _get_storage().save_issue(issue)
     
     print(f"Issue submitted successfully with ID: {issue.id}")
-    print(format_issue(issue, detailed=True))
+    print(_format_issue_detailed(issue))
     return 0
 
 
 def cmd_list(args: argparse.Namespace) -> int:
     """List issues."""
+    from agentic_issues.models import PRIORITY_BY_VALUE, STATUS_BY_VALUE
+    
     project_id = args.project or get_current_project_id()
     if not project_id:
         print("Error: Could not determine project ID. Please specify with --project.")
         return 1
     
-    # Get issues for the project
-    issues = default_storage.get_issues(project_id)
-    
-    # Filter by status if specified
+    # Parse the filters; an invalid value is ignored
+    status = None
     if args.status:
-        try:
-            status = IssueStatus(args.status.lower())
-            issues = [i for i in issues if i.status == status]
-        except ValueError:
+        status = STATUS_BY_VALUE.get(args.status.lower())
+        if status is None:
             print(f"Warning: Invalid status '{args.status}'. Showing all issues.")
     
-    # Filter by priority if specified
+    priority = None
     if args.priority:
-        try:
-            priority = IssuePriority(args.priority.lower())
-            issues = [i for i in issues if i.priority == priority]
-        except ValueError:
+        priority = PRIORITY_BY_VALUE.get(args.priority.lower())
+        if priority is None:
             print(f"Warning: Invalid priority '{args.priority}'. Showing all issues.")
     
-    # Filter by label if specified
-    if args.label:
-        issues = [i for i in issues if args.label in i.labels]
-    
-    # Sort issues
-    if args.sort == "priority":
-        # Sort by priority (highest first)
-        priority_order = {
-            IssuePriority.CRITICAL: 0,
-            IssuePriority.HIGH: 1,
-            IssuePriority.MEDIUM: 2,
-            IssuePriority.LOW: 3,
-        }
-        issues.sort(key=lambda i: priority_order.get(i.priority, 4))
-    elif args.sort == "created":
-        # Sort by creation date (newest first)
-        issues.sort(key=lambda i: i.created_at, reverse=True)
-    elif args.sort == "updated":
-        # Sort by update date (newest first), with None values last
-        issues.sort(key=lambda i: (i.updated_at is None, i.updated_at or datetime.datetime.min), reverse=True)
+    # Get the matching issues for the project, sorted
+    issues = _get_storage().query_issues(project_id, status=status, priority=priority,
+                                         label=args.label, sort=args.sort)
     
     # Display issues
     if not issues:
         print(f"No issues found for project '{project_id}'.")
         return 0
     
-    print(f"Issues for project '{project_id}':")
-    for i, issue in enumerate(issues, 1):
-        print(f"\n{i}. {format_issue(issue, detailed=args.detailed)}")
+    # Write the whole listing at once instead of printing each issue
+    fmt = _format_issue_detailed if args.detailed else _format_issue_summary
+    out = [f"Issues for project '{project_id}':\n"]
+    out.extend(f"\n{i}. {fmt(issue)}\n" for i, issue in enumerate(issues, 1))
+    sys.stdout.write("".join(out))
+    sys.stdout.flush()
     
     return 0
 
@@ -216,13 +243,14 @@ def cmd_show(args: argparse.Namespace) -> int:
         return 1
     
     # Get the issue
-    issue = default_storage.get_issue(project_id, issue_id)
+    storage = _get_storage()
+    issue = storage.get_issue(project_id, issue_id)
     if not issue:
         print(f"Error: Issue '{issue_id}' not found in project '{project_id}'.")
         return 1
     
     # Display the issue
-    print(format_issue(issue, detailed=True))
+    print(_format_issue_detailed(issue))
     return 0
 
 
@@ -239,7 +267,8 @@ def cmd_comment(args: argparse.Namespace) -> int:
         return 1
     
     # Get the issue
-    issue = default_storage.get_issue(project_id, issue_id)
+    storage = _get_storage()
+    issue = storage.get_issue(project_id, issue_id)
     if not issue:
         print(f"Error: Issue '{issue_id}' not found in project '{project_id}'.")
         return 1
@@ -249,20 +278,14 @@ def cmd_comment(args: argparse.Namespace) -> int:
     if not content:
         # If no content is provided, prompt for it
         print("Please enter your comment (press Ctrl+D or Ctrl+Z on a new line to finish):")
-        content_lines = []
-        try:
-            while True:
-                line = input()
-                content_lines.append(line)
-        except EOFError:
-            content = "\n".join(content_lines)
+        content = _read_until_eof()
     
     # Add the comment
     author = get_current_user()
     issue.add_comment(author, content)
     
     # Save the issue
-    default_storage.save_issue(issue)
+    storage.save_issue(issue)
     
     print(f"Comment added to issue {issue_id}.")
     return 0
@@ -270,6 +293,8 @@ def cmd_comment(args: argparse.Namespace) -> int:
 
 def cmd_update(args: argparse.Namespace) -> int:
     """Update an issue."""
+    from agentic_issues.models import PRIORITY_BY_VALUE, STATUS_BY_VALUE
+    
     project_id = args.project or get_current_project_id()
     if not project_id:
         print("Error: Could not determine project ID. Please specify with --project.")
@@ -281,104 +306,154 @@ def cmd_update(args: argparse.Namespace) -> int:
         return 1
     
     # Get the issue
-    issue = default_storage.get_issue(project_id, issue_id)
+    storage = _get_storage()
+    issue = storage.get_issue(project_id, issue_id)
     if not issue:
         print(f"Error: Issue '{issue_id}' not found in project '{project_id}'.")
         return 1
     
-    # Update status if specified
+    # Parse the new status and priority; an invalid value is not applied
+    status = None
     if args.status:
-        try:
-            status = IssueStatus(args.status.lower())
-            issue.update_status(status)
-            print(f"Status updated to {status.value}.")
-        except ValueError:
+        status = STATUS_BY_VALUE.get(args.status.lower())
+        if status is None:
             print(f"Warning: Invalid status '{args.status}'. Status not updated.")
     
-    # Update priority if specified
+    priority = None
     if args.priority:
-        try:
-            priority = IssuePriority(args.priority.lower())
-            issue.update_priority(priority)
-            print(f"Priority updated to {priority.value}.")
-        except ValueError:
+        priority = PRIORITY_BY_VALUE.get(args.priority.lower())
+        if priority is None:
             print(f"Warning: Invalid priority '{args.priority}'. Priority not updated.")
     
-    # Update assignee if specified
-    if args.assignee:
-        issue.assign(args.assignee)
-        print(f"Assignee updated to {args.assignee}.")
-    
-    # Add label if specified
-    if args.add_label:
-        issue.add_label(args.add_label)
-        print(f"Label '{args.add_label}' added.")
-    
-    # Save the issue
-    default_storage.save_issue(issue)
+    assignee = args.assignee or None
+    label = args.add_label or None
     
+    # Apply all the changes in memory, then save the issue once
+    changed = issue.apply_updates(status=status, priority=priority, assignee=assignee, label=label)
+    if not changed:
+        print(f"No changes made to issue {issue_id}.")
+        return 0
+    storage.save_issue(issue)
+    
+    if "status" in changed:
+        print(f"Status updated to {status.value}.")
+    if "priority" in changed:
+        print(f"Priority updated to {priority.value}.")
+    if "assignee" in changed:
+        print(f"Assignee updated to {assignee}.")
+    if "labels" in changed:
+        print(f"Label '{label}' added.")
     print(f"Issue {issue_id} updated successfully.")
     return 0
 
 
-def main(argv: Optional[List[str]] = None) -> int:
-    """Main entry point for the CLI."""
-    parser = argparse.ArgumentParser(description="Agentic Issues - Issue tracking for Agentic projects")
+_DESCRIPTION = "Agentic Issues - Issue tracking for Agentic projects"
+
+
+def _add_submit_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of the submit command to a parser."""
+    parser.add_argument("--project", help="Project ID (defaults to current directory)")
+    parser.add_argument("--title", help="Issue title")
+    parser.add_argument("--description", help="Issue description")
+    parser.add_argument("--priority", help="Issue priority (low, medium, high, critical)")
+    parser.add_argument("--labels", help="Comma-separated list of labels")
+
+
+def _add_list_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of the list command to a parser."""
+    parser.add_argument("--project", help="Project ID (defaults to current directory)")
+    parser.add_argument("--status", help="Filter by status (open, in_progress, resolved, closed)")
+    parser.add_argument("--priority", help="Filter by priority (low, medium, high, critical)")
+    parser.add_argument("--label", help="Filter by label")
+    parser.add_argument("--sort", choices=["priority", "created", "updated"], default="priority",
+                        help="Sort order (default: priority)")
+    parser.add_argument("--detailed", action="store_true", help="Show detailed information")
+
+
+def _add_show_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of the show command to a parser."""
+    parser.add_argument("issue_id", help="Issue ID")
+    parser.add_argument("--project", help="Project ID (defaults to current directory)")
+
+
+def _add_comment_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of the comment command to a parser."""
+    parser.add_argument("issue_id", help="Issue ID")
+    parser.add_argument("--project", help="Project ID (defaults to current directory)")
+    parser.add_argument("--content", help="Comment content")
+
+
+def _add_update_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of the update command to a parser."""
+    parser.add_argument("issue_id", help="Issue ID")
+    parser.add_argument("--project", help="Project ID (defaults to current directory)")
+    parser.add_argument("--status", help="New status (open, in_progress, resolved, closed)")
+    parser.add_argument("--priority", help="New priority (low, medium, high, critical)")
+    parser.add_argument("--assignee", help="Assign to user")
+    parser.add_argument("--add-label", help="Add a label")
+
+
+# Subcommands by name, in help order: (function, one-line help, argument builder)
+_COMMANDS = {
+    "submit": (cmd_submit, "Submit a new issue", _add_submit_arguments),
+    "list": (cmd_list, "List issues", _add_list_arguments),
+    "show": (cmd_show, "Show issue details", _add_show_arguments),
+    "comment": (cmd_comment, "Add a comment to an issue", _add_comment_arguments),
+    "update": (cmd_update, "Update an issue", _add_update_arguments),
+}
+
+
+def _build_parser(with_arguments: bool = True) -> argparse.ArgumentParser:
+    """
+    Build the argument parser for the CLI, with all its subcommands.
+    
+    Args:
+        with_arguments: Also register the arguments of each subcommand. The
+            top-level help only lists the subcommands, so it does not need them.
+    """
+    parser = argparse.ArgumentParser(description=_DESCRIPTION)
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+    for name, (_, command_help, add_arguments) in _COMMANDS.items():
+        command_parser = subparsers.add_parser(name, help=command_help)
+        if with_arguments:
+            add_arguments(command_parser)
+    return parser
+
+
+def _build_command_parser(command: str) -> argparse.ArgumentParser:
+    """
+    Build a standalone argument parser for a single subcommand.
     
-    # Submit command
-    submit_parser = subparsers.add_parser("submit", help="Submit a new issue")
-    submit_parser.add_argument("--project", help="Project ID (defaults to current directory)")
-    submit_parser.add_argument("--title", help="Issue title")
-    submit_parser.add_argument("--description", help="Issue description")
-    submit_parser.add_argument("--priority", help="Issue priority (low, medium, high, critical)")
-    submit_parser.add_argument("--labels", help="Comma-separated list of labels")
-    
-    # List command
-    list_parser = subparsers.add_parser("list", help="List issues")
-    list_parser.add_argument("--project", help="Project ID (defaults to current directory)")
-    list_parser.add_argument("--status", help="Filter by status (open, in_progress, resolved, closed)")
-    list_parser.add_argument("--priority", help="Filter by priority (low, medium, high, critical)")
-    list_parser.add_argument("--label", help="Filter by label")
-    list_parser.add_argument("--sort", choices=["priority", "created", "updated"], default="priority",
-                            help="Sort order (default: priority)")
-    list_parser.add_argument("--detailed", action="store_true", help="Show detailed information")
-    
-    # Show command
-    show_parser = subparsers.add_parser("show", help="Show issue details")
-    show_parser.add_argument("issue_id", help="Issue ID")
-    show_parser.add_argument("--project", help="Project ID (defaults to current directory)")
-    
-    # Comment command
-    comment_parser = subparsers.add_parser("comment", help="Add a comment to an issue")
-    comment_parser.add_argument("issue_id", help="Issue ID")
-    comment_parser.add_argument("--project", help="Project ID (defaults to current directory)")
-    comment_parser.add_argument("--content", help="Comment content")
-    
-    # Update command
-    update_parser = subparsers.add_parser("update", help="Update an issue")
-    update_parser.add_argument("issue_id", help="Issue ID")
-    update_parser.add_argument("--project", help="Project ID (defaults to current directory)")
-    update_parser.add_argument("--status", help="New status (open, in_progress, resolved, closed)")
-    update_parser.add_argument("--priority", help="New priority (low, medium, high, critical)")
-    update_parser.add_argument("--assignee", help="Assign to user")
-    update_parser.add_argument("--add-label", help="Add a label")
-    
-    args = parser.parse_args(argv)
-    
-    if args.command == "submit":
-        return cmd_submit(args)
-    elif args.command == "list":
-        return cmd_list(args)
-    elif args.command == "show":
-        return cmd_show(args)
-    elif args.command == "comment":
-        return cmd_comment(args)
-    elif args.command == "update":
-        return cmd_update(args)
-    else:
+    Its program name includes the subcommand, so usage and error messages
+    read as they do for the subparser of the full parser.
+    """
+    prog = f"{os.path.basename(sys.argv[0])} {command}"
+    parser = argparse.ArgumentParser(prog=prog)
+    parser.set_defaults(command=command)
+    _COMMANDS[command][2](parser)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the CLI."""
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    # Print the help without the subcommand arguments when that is all there is to do
+    if not argv or argv[0] in ("-h", "--help"):
+        _build_parser(with_arguments=False).print_help()
+        return 0 if argv else 1
+    
+    # Known subcommands are parsed by their own parser alone; anything else
+    # goes through the full parser, which reports the error
+    if argv[0] not in _COMMANDS:
+        parser = _build_parser()
+        parser.parse_args(argv)
         parser.print_help()
         return 1
+    
+    args = _build_command_parser(argv[0]).parse_args(argv[1:])
+    return _COMMANDS[argv[0]][0](args)
 
 
 if __name__ == "__main__":
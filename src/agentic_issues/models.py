@@ -5,6 +5,7 @@ Data models for the Agentic Issues system.
 import dataclasses
 import datetime
 import enum
+import sys
 import uuid
 from typing import List, Optional
 
@@ -25,7 +26,24 @@ class IssuePriority(enum.Enum):
     CRITICAL = "critical"
 
 
-@dataclasses.dataclass
+# Enum members by value, for validating user input without raising
+STATUS_BY_VALUE = {status.value: status for status in IssueStatus}
+PRIORITY_BY_VALUE = {priority.value: priority for priority in IssuePriority}
+
+# Priorities in sort order, highest first
+PRIORITY_ORDER = (
+    IssuePriority.CRITICAL,
+    IssuePriority.HIGH,
+    IssuePriority.MEDIUM,
+    IssuePriority.LOW,
+)
+
+# Models use __slots__ instead of a per-instance __dict__ where dataclasses
+# support it (Python 3.10+)
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclasses.dataclass(**_DATACLASS_OPTIONS)
 class IssueComment:
     """A comment on an issue."""
     id: str
@@ -36,7 +54,7 @@ class IssueComment:
     updated_at: Optional[datetime.datetime] = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(**_DATACLASS_OPTIONS)
 class Issue:
     """An issue in the Agentic Issues system."""
     id: str
@@ -70,15 +88,16 @@ class Issue:
 
     def add_comment(self, author: str, content: str) -> IssueComment:
         """Add a comment to the issue."""
+        now = datetime.datetime.now()
         comment = IssueComment(
             id=str(uuid.uuid4()),
             issue_id=self.id,
             author=author,
             content=content,
-            created_at=datetime.datetime.now(),
+            created_at=now,
         )
         self.comments.append(comment)
-        self.updated_at = datetime.datetime.now()
+        self.updated_at = now
         return comment
 
     def update_status(self, status: IssueStatus) -> None:
@@ -96,6 +115,36 @@ class Issue:
         self.assignee = assignee
         self.updated_at = datetime.datetime.now()
 
+    def apply_updates(self, status: Optional[IssueStatus] = None,
+                      priority: Optional[IssuePriority] = None,
+                      assignee: Optional[str] = None,
+                      label: Optional[str] = None) -> List[str]:
+        """
+        Apply several updates to the issue at once.
+        
+        Only the given fields are changed, and updated_at is set a single time.
+        
+        Returns:
+            List[str]: Names of the fields that changed ("status", "priority",
+            "assignee" and "labels"), empty if the issue is unchanged.
+        """
+        changed = []
+        if status is not None and status != self.status:
+            self.status = status
+            changed.append("status")
+        if priority is not None and priority != self.priority:
+            self.priority = priority
+            changed.append("priority")
+        if assignee is not None and assignee != self.assignee:
+            self.assignee = assignee
+            changed.append("assignee")
+        if label is not None and label not in self.labels:
+            self.labels.append(label)
+            changed.append("labels")
+        if changed:
+            self.updated_at = datetime.datetime.now()
+        return changed
+
     def add_label(self, label: str) -> None:
         """Add a label to the issue."""
         if label not in self.labels:
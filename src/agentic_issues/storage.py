@@ -4,18 +4,40 @@ Storage module for the Agentic Issues system.
 This module handles persisting issues to disk and loading them back.
 """
 
+import concurrent.futures
+import contextlib
 import dataclasses
 import datetime
 import json
+import operator
 import os
 import pathlib
-from typing import Dict, List, Optional, Union
+import tempfile
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
-from agentic_issues.models import Issue, IssueComment, IssuePriority, IssueStatus
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from agentic_issues.models import (
+    PRIORITY_BY_VALUE,
+    PRIORITY_ORDER,
+    STATUS_BY_VALUE,
+    Issue,
+    IssueComment,
+    IssuePriority,
+    IssueStatus,
+)
 
 
 class EnhancedJSONEncoder(json.JSONEncoder):
-    """JSON encoder that can handle dataclasses, enums, and datetime objects."""
+    """
+    JSON encoder that can handle dataclasses, enums, and datetime objects.
+    
+    IssueStorage no longer uses it (issues are encoded by _encode_issue); it is
+    kept for external code that serializes issues with json.dumps(cls=...).
+    """
 
     def default(self, o):
         if dataclasses.is_dataclass(o) and not isinstance(o, type):
@@ -27,29 +49,102 @@ class EnhancedJSONEncoder(json.JSONEncoder):
         return super().default(o)
 
 
+def _dump_issues(issue_dicts: List[Dict]) -> bytes:
+    """Serialize issue records to UTF-8 encoded JSON."""
+    if orjson is not None:
+        return orjson.dumps(issue_dicts, option=orjson.OPT_INDENT_2)
+    return json.dumps(issue_dicts, indent=2).encode("utf-8")
+
+
+def _load_json(data: bytes):
+    """Parse UTF-8 encoded JSON."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _current_umask() -> int:
+    """Return the process umask, which can only be read by setting it."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Bound once, it is called for every timestamp of every decoded issue
+_fromisoformat = datetime.datetime.fromisoformat
+
+
+def _encode_comment(comment: IssueComment) -> Dict:
+    """Encode a comment as a dictionary of JSON types (the inverse of _decode_comment)."""
+    created_at = comment.created_at
+    updated_at = comment.updated_at
+    return {
+        "id": comment.id,
+        "issue_id": comment.issue_id,
+        "author": comment.author,
+        "content": comment.content,
+        "created_at": created_at.isoformat() if created_at else created_at,
+        "updated_at": updated_at.isoformat() if updated_at else updated_at,
+    }
+
+
+def _encode_issue(issue: Issue) -> Dict:
+    """Encode an issue as a dictionary of JSON types (the inverse of _decode_issue)."""
+    created_at = issue.created_at
+    updated_at = issue.updated_at
+    return {
+        "id": issue.id,
+        "project_id": issue.project_id,
+        "title": issue.title,
+        "description": issue.description,
+        "status": issue.status.value,
+        "priority": issue.priority.value,
+        "author": issue.author,
+        "assignee": issue.assignee,
+        "created_at": created_at.isoformat() if created_at else created_at,
+        "updated_at": updated_at.isoformat() if updated_at else updated_at,
+        "comments": [_encode_comment(c) for c in issue.comments],
+        "labels": list(issue.labels),
+    }
+
+
+def _decode_comment(comment_dict: Dict) -> IssueComment:
+    """Decode a comment from a dictionary."""
+    created_at = comment_dict["created_at"]
+    updated_at = comment_dict.get("updated_at")
+    return IssueComment(
+        id=comment_dict["id"],
+        issue_id=comment_dict["issue_id"],
+        author=comment_dict["author"],
+        content=comment_dict["content"],
+        created_at=_fromisoformat(created_at) if created_at else created_at,
+        updated_at=_fromisoformat(updated_at) if updated_at else updated_at,
+    )
+
+
 def _decode_issue(issue_dict: Dict) -> Issue:
-    """Decode an issue from a dictionary."""
-    # Convert string status and priority to enum values
-    issue_dict["status"] = IssueStatus(issue_dict["status"])
-    issue_dict["priority"] = IssuePriority(issue_dict["priority"])
-
-    # Convert string timestamps to datetime objects
-    if issue_dict["created_at"]:
-        issue_dict["created_at"] = datetime.datetime.fromisoformat(issue_dict["created_at"])
-    if issue_dict["updated_at"]:
-        issue_dict["updated_at"] = datetime.datetime.fromisoformat(issue_dict["updated_at"])
-
-    # Convert comment dictionaries to IssueComment objects
-    comments = []
-    for comment_dict in issue_dict.get("comments", []):
-        if comment_dict["created_at"]:
-            comment_dict["created_at"] = datetime.datetime.fromisoformat(comment_dict["created_at"])
-        if comment_dict.get("updated_at"):
-            comment_dict["updated_at"] = datetime.datetime.fromisoformat(comment_dict["updated_at"])
-        comments.append(IssueComment(**comment_dict))
-    issue_dict["comments"] = comments
-
-    return Issue(**issue_dict)
+    """
+    Decode an issue from a dictionary.
+    
+    The dictionary is left unmodified, and nothing mutable is shared with it,
+    so cached records can be decoded again.
+    """
+    created_at = issue_dict["created_at"]
+    updated_at = issue_dict["updated_at"]
+    return Issue(
+        id=issue_dict["id"],
+        project_id=issue_dict["project_id"],
+        title=issue_dict["title"],
+        description=issue_dict["description"],
+        status=STATUS_BY_VALUE[issue_dict["status"]],
+        priority=PRIORITY_BY_VALUE[issue_dict["priority"]],
+        author=issue_dict["author"],
+        assignee=issue_dict.get("assignee"),
+        created_at=_fromisoformat(created_at) if created_at else created_at,
+        updated_at=_fromisoformat(updated_at) if updated_at else updated_at,
+        comments=[_decode_comment(c) for c in issue_dict.get("comments", ())],
+        labels=list(issue_dict.get("labels", ())),
+    )
 
 
 class IssueStorage:
@@ -60,61 +155,217 @@ class IssueStorage:
         self.base_dir = pathlib.Path(base_dir)
         self.issues_dir = self.base_dir / "issues"
         self.issues_dir.mkdir(parents=True, exist_ok=True)
+        # Parsed records of each project file and their positions by issue ID,
+        # with the (mtime, size) the file was read at
+        self._cache: Dict[str, Tuple[Tuple[int, int], List[Dict], Dict[str, int]]] = {}
 
     def _get_project_file(self, project_id: str) -> pathlib.Path:
         """Get the path to the file for a project's issues."""
         return self.issues_dir / f"{project_id}.json"
 
+    def _write_issues(self, project_id: str, issue_dicts: List[Dict]) -> None:
+        """
+        Write the issue records of a project to its file.
+        
+        The data is written to a temporary file that then replaces the project
+        file, so readers never see a partially written file. The records are
+        kept as the cached contents of the file, so reading the project again
+        does not parse what was just written; they must not be modified after
+        this call.
+        """
+        project_file = self._get_project_file(project_id)
+        # Each writer gets its own temporary file, so concurrent saves of the
+        # same project cannot clobber each other's data before the rename
+        fd, tmp_name = tempfile.mkstemp(dir=self.issues_dir, prefix=project_file.name + ".",
+                                        suffix=".tmp")
+        try:
+            with open(fd, "wb") as f:
+                # mkstemp creates the file private to its owner; keep the
+                # permissions of the file being replaced, or give a new file
+                # the ones open() would
+                try:
+                    os.chmod(tmp_name, os.stat(project_file).st_mode & 0o777)
+                except FileNotFoundError:
+                    os.chmod(tmp_name, 0o666 & ~_current_umask())
+                f.write(_dump_issues(issue_dicts))
+                f.flush()
+                # Renaming keeps the modification time, so this is the key the
+                # project file will be read with
+                stat = os.fstat(f.fileno())
+            os.replace(tmp_name, project_file)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_name)
+            raise
+        
+        positions = {d["id"]: i for i, d in enumerate(issue_dicts)}
+        self._cache[project_id] = ((stat.st_mtime_ns, stat.st_size), issue_dicts, positions)
+
     def save_issue(self, issue: Issue) -> None:
         """Save an issue to storage."""
-        project_file = self._get_project_file(issue.project_id)
+        self.save_issues([issue])
+
+    def save_issues(self, issues: List[Issue]) -> None:
+        """
+        Save several issues to storage.
         
-        # Load existing issues for the project
-        issues = self.get_issues(issue.project_id)
+        Issues are grouped by project so that each project file is read and
+        written once, regardless of how many of its issues are saved.
+        """
+        issues_by_project: Dict[str, List[Issue]] = {}
+        for issue in issues:
+            issues_by_project.setdefault(issue.project_id, []).append(issue)
         
-        # Update or add the issue
-        issue_index = next((i for i, x in enumerate(issues) if x.id == issue.id), None)
-        if issue_index is not None:
-            issues[issue_index] = issue
-        else:
-            issues.append(issue)
+        for project_id, new_issues in issues_by_project.items():
+            # Load existing issues for the project, without decoding them
+            issue_dicts, positions = self._load_project(project_id)
+            project_issues = list(issue_dicts)
+            positions = dict(positions)
+            
+            # Update or add each issue
+            for issue in new_issues:
+                issue_index = positions.get(issue.id)
+                if issue_index is not None:
+                    project_issues[issue_index] = _encode_issue(issue)
+                else:
+                    positions[issue.id] = len(project_issues)
+                    project_issues.append(_encode_issue(issue))
+            
+            # Save all issues back to the file
+            self._write_issues(project_id, project_issues)
+
+    def _load_project(self, project_id: str) -> Tuple[List[Dict], Dict[str, int]]:
+        """
+        Load the raw issue records of a project and their positions by ID.
+        
+        Both are cached until the file's modification time or size changes.
+        They are shared between calls and must not be modified.
+        """
+        project_file = self._get_project_file(project_id)
+        try:
+            stat = os.stat(project_file)
+        except FileNotFoundError:
+            self._cache.pop(project_id, None)
+            return [], {}
+        
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(project_id)
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+        
+        with open(project_file, "rb") as f:
+            data = f.read()
+        try:
+            issue_dicts = _load_json(data)
+        except json.JSONDecodeError:
+            # If the file is empty or invalid, return an empty list
+            # (orjson.JSONDecodeError is a subclass of json.JSONDecodeError)
+            issue_dicts = []
+        positions = {d["id"]: i for i, d in enumerate(issue_dicts)}
         
-        # Save all issues back to the file
-        with open(project_file, "w") as f:
-            json.dump([dataclasses.asdict(i) for i in issues], f, cls=EnhancedJSONEncoder, indent=2)
+        self._cache[project_id] = (key, issue_dicts, positions)
+        return issue_dicts, positions
+
+    def _load_issue_dicts(self, project_id: str) -> List[Dict]:
+        """Load the raw issue records of a project (see _load_project)."""
+        return self._load_project(project_id)[0]
 
     def get_issues(self, project_id: str) -> List[Issue]:
         """Get all issues for a project."""
-        project_file = self._get_project_file(project_id)
-        if not project_file.exists():
-            return []
+        return [_decode_issue(issue_dict) for issue_dict in self._load_issue_dicts(project_id)]
+
+    def query_issues(self, project_id: str, status: Optional[IssueStatus] = None,
+                     priority: Optional[IssuePriority] = None, label: Optional[str] = None,
+                     sort: Optional[str] = None, limit: Optional[int] = None) -> List[Issue]:
+        """
+        Get the issues of a project matching the given filters.
+        
+        Records are filtered before they are decoded, so issues that do not
+        match are never turned into Issue objects.
+        
+        Args:
+            project_id: The project to query.
+            status: Only return issues with this status.
+            priority: Only return issues with this priority.
+            label: Only return issues with this label.
+            sort: "priority" (highest first), "created" (newest first) or
+                "updated" (most recently updated first, never updated last).
+            limit: Maximum number of issues to return.
+        """
+        issue_dicts = self._load_issue_dicts(project_id)
+        if status or priority or label:
+            status_value = status.value if status else None
+            priority_value = priority.value if priority else None
+            issue_dicts = [
+                d for d in issue_dicts
+                if (status_value is None or d["status"] == status_value)
+                and (priority_value is None or d["priority"] == priority_value)
+                and (not label or label in (d.get("labels") or ()))
+            ]
+        issues = [_decode_issue(issue_dict) for issue_dict in issue_dicts]
         
-        with open(project_file, "r") as f:
-            try:
-                issues_data = json.load(f)
-                return [_decode_issue(issue_dict) for issue_dict in issues_data]
-            except json.JSONDecodeError:
-                # If the file is empty or invalid, return an empty list
-                return []
+        if sort == "priority":
+            # Group the issues by priority, highest first. Within a priority
+            # they keep their stored order, as a stable sort would.
+            by_priority: Dict[IssuePriority, List[Issue]] = {p: [] for p in PRIORITY_ORDER}
+            for issue in issues:
+                by_priority[issue.priority].append(issue)
+            issues = [issue for priority in PRIORITY_ORDER for issue in by_priority[priority]]
+        elif sort == "created":
+            issues.sort(key=operator.attrgetter("created_at"), reverse=True)
+        elif sort == "updated":
+            # Sort the updated issues and keep the never-updated ones last
+            updated = [i for i in issues if i.updated_at is not None]
+            updated.sort(key=operator.attrgetter("updated_at"), reverse=True)
+            issues = updated + [i for i in issues if i.updated_at is None]
+        
+        if limit is not None:
+            issues = issues[:limit]
+        return issues
 
     def get_issue(self, project_id: str, issue_id: str) -> Optional[Issue]:
         """Get a specific issue by ID."""
-        issues = self.get_issues(project_id)
-        return next((i for i in issues if i.id == issue_id), None)
+        issue_dicts, positions = self._load_project(project_id)
+        position = positions.get(issue_id)
+        if position is None:
+            return None
+        return _decode_issue(issue_dicts[position])
+
+    @contextlib.contextmanager
+    def mutate_issue(self, project_id: str, issue_id: str) -> Iterator[Optional[Issue]]:
+        """
+        Load an issue for modification and save it when the block exits.
+        
+        The project's issues are read once and the issue is written back with
+        them, without reading the project file again; only the issue itself is
+        decoded. The write happens only if the block exits normally and the
+        issue changed in any field, whether through an Issue mutator or by
+        direct assignment. Yields None if the issue does not exist.
+        """
+        issue_dicts, positions = self._load_project(project_id)
+        position = positions.get(issue_id)
+        if position is None:
+            yield None
+            return
+        
+        issue = _decode_issue(issue_dicts[position])
+        loaded = _encode_issue(issue)
+        yield issue
+        issue_dict = _encode_issue(issue)
+        if issue_dict != loaded:
+            issue_dicts = list(issue_dicts)
+            issue_dicts[position] = issue_dict
+            self._write_issues(project_id, issue_dicts)
 
     def delete_issue(self, project_id: str, issue_id: str) -> bool:
         """Delete an issue by ID."""
-        issues = self.get_issues(project_id)
-        initial_count = len(issues)
-        issues = [i for i in issues if i.id != issue_id]
-        
-        if len(issues) == initial_count:
+        issue_dicts, positions = self._load_project(project_id)
+        position = positions.get(issue_id)
+        if position is None:
             # No issue was removed
             return False
         
-        project_file = self._get_project_file(project_id)
-        with open(project_file, "w") as f:
-            json.dump([dataclasses.asdict(i) for i in issues], f, cls=EnhancedJSONEncoder, indent=2)
+        self._write_issues(project_id, issue_dicts[:position] + issue_dicts[position + 1:])
         
         return True
 
@@ -123,6 +374,25 @@ class IssueStorage:
         project_files = list(self.issues_dir.glob("*.json"))
         return [p.stem for p in project_files]
 
+    def get_all_issues(self, project_ids: Optional[List[str]] = None) -> Dict[str, List[Issue]]:
+        """
+        Get the issues of several projects, by project ID.
+        
+        Project files are read on a small thread pool so that their disk reads
+        overlap.
+        
+        Args:
+            project_ids: The projects to read; defaults to all projects that
+                have issues.
+        """
+        if project_ids is None:
+            project_ids = self.get_all_project_ids()
+        if len(project_ids) <= 1:
+            return {project_id: self.get_issues(project_id) for project_id in project_ids}
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(project_ids))) as executor:
+            return dict(zip(project_ids, executor.map(self.get_issues, project_ids)))
+
 
 # Create a default storage instance
 agentic_home = os.environ.get("AGHOME", os.path.expanduser("~/Agentic"))
@@ -0,0 +1,172 @@
+"""
+Tests for the ag_issues module.
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the src directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from agentic_issues.ag_issues import issue_command
+from agentic_issues.models import IssuePriority, IssueStatus
+from agentic_issues.storage import IssueStorage
+
+
+class TestAgIssues(unittest.TestCase):
+    """Tests for the `ag issue` command."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.storage = IssueStorage(self.test_dir)
+        self.patches = [
+            patch("agentic_issues.storage.default_storage", self.storage),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def run_command(self, *args):
+        """Run the command and return its exit code and output."""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            result = issue_command(list(args))
+        return result, output.getvalue()
+
+    def submit(self, title="Test Issue", *args):
+        """Submit an issue and return it."""
+        self.run_command("submit", "--project", "test-project", "--title", title, *args)
+        return self.storage.get_issues("test-project")[-1]
+
+    def test_command_help(self):
+        """Test that a command's --help describes that command."""
+        output = io.StringIO()
+        with redirect_stdout(output), self.assertRaises(SystemExit) as cm:
+            issue_command(["show", "--help"])
+        self.assertEqual(cm.exception.code, 0)
+        self.assertIn("show [-h]", output.getvalue())
+        self.assertIn("issue_id", output.getvalue())
+
+    def test_no_command(self):
+        """Test that running without a command prints help."""
+        result, output = self.run_command()
+        self.assertEqual(result, 1)
+        self.assertIn("usage:", output)
+
+    def test_help(self):
+        """Test that --help prints help and succeeds."""
+        result, output = self.run_command("--help")
+        self.assertEqual(result, 0)
+        self.assertIn("{submit,list,show,comment,update}", output)
+
+    def test_submit(self):
+        """Test submitting an issue."""
+        issue = self.submit("Test Issue", "--priority", "high", "--labels", "bug, ui,")
+
+        self.assertEqual(issue.title, "Test Issue")
+        self.assertEqual(issue.priority, IssuePriority.HIGH)
+        self.assertEqual(issue.labels, ["bug", "ui"])
+
+    def test_project_follows_current_directory(self):
+        """Test that the default project follows a change of directory."""
+        old_cwd = os.getcwd()
+        try:
+            for name in ("project-a", "project-b"):
+                project_dir = Path(self.test_dir, name)
+                project_dir.mkdir()
+                os.chdir(project_dir)
+                self.run_command("submit", "--title", f"Issue in {name}")
+        finally:
+            os.chdir(old_cwd)
+
+        self.assertEqual([i.title for i in self.storage.get_issues("project-a")], ["Issue in project-a"])
+        self.assertEqual([i.title for i in self.storage.get_issues("project-b")], ["Issue in project-b"])
+
+    def test_invalid_priority(self):
+        """Test that an invalid priority is rejected by the parser."""
+        with redirect_stderr(io.StringIO()) as error, self.assertRaises(SystemExit) as cm:
+            self.run_command("submit", "--project", "test-project", "--title", "Test Issue",
+                             "--priority", "urgent")
+
+        self.assertEqual(cm.exception.code, 2)
+        self.assertIn("invalid priority 'urgent'", error.getvalue())
+        self.assertEqual(self.storage.get_issues("test-project"), [])
+
+    def test_list(self):
+        """Test listing and filtering issues."""
+        self.submit("Low Issue", "--priority", "low")
+        self.submit("Critical Issue", "--priority", "critical", "--labels", "bug")
+
+        result, output = self.run_command("list", "--project", "test-project")
+        self.assertEqual(result, 0)
+        self.assertLess(output.index("Critical Issue"), output.index("Low Issue"))
+
+        result, output = self.run_command("list", "--project", "test-project", "--label", "bug")
+        self.assertEqual(result, 0)
+        self.assertNotIn("Low Issue", output)
+
+    def test_show(self):
+        """Test showing an issue."""
+        issue = self.submit()
+
+        result, output = self.run_command("show", issue.id, "--project", "test-project")
+        self.assertEqual(result, 0)
+        self.assertIn(f"ID: {issue.id}", output)
+
+        result, output = self.run_command("show", "missing", "--project", "test-project")
+        self.assertEqual(result, 1)
+
+    def test_update(self):
+        """Test updating an issue."""
+        issue = self.submit()
+
+        result, _ = self.run_command("update", issue.id, "--project", "test-project",
+                                     "--status", "in_progress", "--assignee", "someone",
+                                     "--add-label", "ui")
+
+        self.assertEqual(result, 0)
+        issue = self.storage.get_issue("test-project", issue.id)
+        self.assertEqual(issue.status, IssueStatus.IN_PROGRESS)
+        self.assertEqual(issue.assignee, "someone")
+        self.assertEqual(issue.labels, ["ui"])
+
+    def test_update_without_changes(self):
+        """Test that an update to the current values reports no changes."""
+        issue = self.submit("Test Issue", "--labels", "ui")
+
+        result, output = self.run_command("update", issue.id, "--project", "test-project",
+                                          "--status", "open", "--add-label", "ui")
+
+        self.assertEqual(result, 0)
+        self.assertIn("No changes made", output)
+        self.assertNotIn("updated", output)
+        self.assertNotIn("added", output)
+        self.assertIsNone(self.storage.get_issue("test-project", issue.id).updated_at)
+
+    def test_comment(self):
+        """Test commenting on an issue."""
+        issue = self.submit()
+
+        result, _ = self.run_command("comment", issue.id, "--project", "test-project",
+                                     "--content", "Test Comment")
+
+        self.assertEqual(result, 0)
+        issue = self.storage.get_issue("test-project", issue.id)
+        self.assertEqual([c.content for c in issue.comments], ["Test Comment"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,16 +2,18 @@
 Tests for the CLI module.
 """
 
+import io
 import os
 import sys
 import unittest
+from contextlib import redirect_stdout
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 
 # Add the src directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from agentic_issues.cli import main, cmd_submit, cmd_list, cmd_show, cmd_comment, cmd_update
+from agentic_issues.cli import _build_command_parser, main, cmd_submit, cmd_list, cmd_show, cmd_comment, cmd_update
 from agentic_issues.models import Issue, IssueStatus, IssuePriority
 
 
@@ -32,26 +34,23 @@ class TestCLI(unittest.TestCase):
         self.mock_storage = MagicMock()
         self.mock_storage.get_issues.return_value = []
         
-        # Create a mock issue
-        self.mock_issue = MagicMock(spec=Issue)
-        self.mock_issue.id = "test-id"
-        self.mock_issue.title = "Test Issue"
-        self.mock_issue.description = "Test Description"
-        self.mock_issue.status = IssueStatus.OPEN
-        self.mock_issue.priority = IssuePriority.MEDIUM
-        self.mock_issue.author = "test-user"
-        self.mock_issue.assignee = None
-        self.mock_issue.created_at = None
-        self.mock_issue.updated_at = None
-        self.mock_issue.comments = []
-        self.mock_issue.labels = []
+        # Create a test issue
+        self.issue = Issue(
+            id="test-id",
+            project_id="test-project",
+            title="Test Issue",
+            description="Test Description",
+            status=IssueStatus.OPEN,
+            priority=IssuePriority.MEDIUM,
+            author="test-user",
+        )
         
         # Set up patches
         self.patches = [
-            patch("agentic_issues.cli.default_storage", self.mock_storage),
+            patch("agentic_issues.storage.default_storage", self.mock_storage),
             patch("agentic_issues.cli.get_current_project_id", return_value="test-project"),
             patch("agentic_issues.cli.get_current_user", return_value="test-user"),
-            patch("agentic_issues.cli.Issue.create", return_value=self.mock_issue),
+            patch("agentic_issues.models.Issue.create", return_value=self.issue),
         ]
         
         # Start patches
@@ -84,6 +83,49 @@ class TestCLI(unittest.TestCase):
             result = main()
         self.assertEqual(result, 1)
     
+    def test_main_help(self):
+        """Test main function with --help."""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            result = main(["--help"])
+        self.assertEqual(result, 0)
+        self.assertIn("Add a comment to an issue", output.getvalue())
+    
+    def test_build_command_parser(self):
+        """Test that a single subcommand is parsed by its own parser."""
+        parser = _build_command_parser("show")
+        self.assertTrue(parser.prog.endswith(" show"))
+        
+        args = parser.parse_args(["test-id", "--project", "test-project"])
+        self.assertEqual(args.command, "show")
+        self.assertEqual(args.issue_id, "test-id")
+    
+    def test_main_show(self):
+        """Test that main dispatches the show command."""
+        self.mock_storage.get_issue.return_value = self.issue
+        
+        output = io.StringIO()
+        with redirect_stdout(output):
+            result = main(["show", "test-id", "--project", "test-project"])
+        
+        self.assertEqual(result, 0)
+        self.mock_storage.get_issue.assert_called_once_with("test-project", "test-id")
+        self.assertIn("Test Issue", output.getvalue())
+        self.assertIn("Test Description", output.getvalue())
+    
+    def test_main_list(self):
+        """Test that main dispatches the list command with its options."""
+        self.mock_storage.query_issues.return_value = [self.issue]
+        
+        output = io.StringIO()
+        with redirect_stdout(output):
+            result = main(["list", "--status", "open"])
+        
+        self.assertEqual(result, 0)
+        self.mock_storage.query_issues.assert_called_once_with(
+            "test-project", status=IssueStatus.OPEN, priority=None, label=None, sort="priority")
+        self.assertIn("Test Issue", output.getvalue())
+    
     def test_cmd_submit(self):
         """Test submit command."""
         args = MagicMock()
@@ -96,7 +138,22 @@ class TestCLI(unittest.TestCase):
         result = cmd_submit(args)
         
         self.assertEqual(result, 0)
-        self.mock_storage.save_issue.assert_called_once_with(self.mock_issue)
+        self.mock_storage.save_issue.assert_called_once_with(self.issue)
+    
+    def test_cmd_submit_reads_description(self):
+        """Test that submit reads a missing description from stdin."""
+        args = MagicMock()
+        args.project = "test-project"
+        args.title = "Test Issue"
+        args.description = None
+        args.priority = None
+        args.labels = None
+        
+        with patch("sys.stdin", io.StringIO("Line 1\nLine 2\n")), redirect_stdout(io.StringIO()):
+            result = cmd_submit(args)
+        
+        self.assertEqual(result, 0)
+        self.assertEqual(Issue.create.call_args.kwargs["description"], "Line 1\nLine 2")
     
     def test_cmd_list(self):
         """Test list command."""
@@ -108,12 +165,13 @@ class TestCLI(unittest.TestCase):
         args.sort = "priority"
         args.detailed = False
         
-        self.mock_storage.get_issues.return_value = [self.mock_issue]
+        self.mock_storage.query_issues.return_value = [self.issue]
         
         result = cmd_list(args)
         
         self.assertEqual(result, 0)
-        self.mock_storage.get_issues.assert_called_once_with("test-project")
+        self.mock_storage.query_issues.assert_called_once_with(
+            "test-project", status=None, priority=None, label=None, sort="priority")
     
     def test_cmd_show(self):
         """Test show command."""
@@ -121,7 +179,7 @@ class TestCLI(unittest.TestCase):
         args.project = "test-project"
         args.issue_id = "test-id"
         
-        self.mock_storage.get_issue.return_value = self.mock_issue
+        self.mock_storage.get_issue.return_value = self.issue
         
         result = cmd_show(args)
         
@@ -135,14 +193,15 @@ class TestCLI(unittest.TestCase):
         args.issue_id = "test-id"
         args.content = "Test Comment"
         
-        self.mock_storage.get_issue.return_value = self.mock_issue
+        self.mock_storage.get_issue.return_value = self.issue
         
         result = cmd_comment(args)
         
         self.assertEqual(result, 0)
         self.mock_storage.get_issue.assert_called_once_with("test-project", "test-id")
-        self.mock_storage.save_issue.assert_called_once_with(self.mock_issue)
-        self.mock_issue.add_comment.assert_called_once_with("test-user", "Test Comment")
+        self.mock_storage.save_issue.assert_called_once_with(self.issue)
+        self.assertEqual([(c.author, c.content) for c in self.issue.comments],
+                         [("test-user", "Test Comment")])
     
     def test_cmd_update(self):
         """Test update command."""
@@ -154,14 +213,76 @@ class TestCLI(unittest.TestCase):
         args.assignee = None
         args.add_label = None
         
-        self.mock_storage.get_issue.return_value = self.mock_issue
+        self.mock_storage.get_issue.return_value = self.issue
         
         result = cmd_update(args)
         
         self.assertEqual(result, 0)
         self.mock_storage.get_issue.assert_called_once_with("test-project", "test-id")
-        self.mock_storage.save_issue.assert_called_once_with(self.mock_issue)
-        self.mock_issue.update_status.assert_called_once()
+        self.mock_storage.save_issue.assert_called_once_with(self.issue)
+        self.assertEqual(self.issue.status, IssueStatus.IN_PROGRESS)
+        self.assertIsNotNone(self.issue.updated_at)
+    
+    def test_cmd_update_without_changes(self):
+        """Test that an update without changes does not save the issue."""
+        args = MagicMock()
+        args.project = "test-project"
+        args.issue_id = "test-id"
+        args.status = "bogus"
+        args.priority = None
+        args.assignee = None
+        args.add_label = None
+        
+        self.mock_storage.get_issue.return_value = self.issue
+        
+        with redirect_stdout(io.StringIO()):
+            result = cmd_update(args)
+        
+        self.assertEqual(result, 0)
+        self.mock_storage.save_issue.assert_not_called()
+    
+    def test_cmd_update_reports_changed_fields(self):
+        """Test that only the fields that changed are reported."""
+        args = MagicMock()
+        args.project = "test-project"
+        args.issue_id = "test-id"
+        args.status = "open"
+        args.priority = "high"
+        args.assignee = None
+        args.add_label = None
+        
+        self.mock_storage.get_issue.return_value = self.issue
+        
+        output = io.StringIO()
+        with redirect_stdout(output):
+            result = cmd_update(args)
+        
+        self.assertEqual(result, 0)
+        self.mock_storage.save_issue.assert_called_once_with(self.issue)
+        self.assertNotIn("Status updated", output.getvalue())
+        self.assertIn("Priority updated to high.", output.getvalue())
+    
+    def test_cmd_update_existing_label(self):
+        """Test that adding a label the issue already has does not save it."""
+        args = MagicMock()
+        args.project = "test-project"
+        args.issue_id = "test-id"
+        args.status = None
+        args.priority = None
+        args.assignee = None
+        args.add_label = "bug"
+        
+        self.issue.labels.append("bug")
+        self.mock_storage.get_issue.return_value = self.issue
+        
+        output = io.StringIO()
+        with redirect_stdout(output):
+            result = cmd_update(args)
+        
+        self.assertEqual(result, 0)
+        self.mock_storage.save_issue.assert_not_called()
+        self.assertNotIn("added", output.getvalue())
+        self.assertIn("No changes made", output.getvalue())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,127 @@
+"""
+Tests for the install_ag_issues script.
+"""
+
+import importlib.util
+import io
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# The installer is a script rather than part of the package, so load it by path
+_SCRIPT = Path(__file__).parent.parent / "scripts" / "install_ag_issues.py"
+_spec = importlib.util.spec_from_file_location("install_ag_issues", _SCRIPT)
+install_ag_issues = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(install_ag_issues)
+
+
+class TestPatchAgScript(unittest.TestCase):
+    """Tests for registering a command in the ag script."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        (self.test_dir / "agentic" / "scripts").mkdir(parents=True)
+        self.ag_path = self.test_dir / "agentic" / "ag"
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def patch(self, ag_script, cmd="issue"):
+        """Patch an ag script and return the exit code and the resulting commands."""
+        self.ag_path.write_text(ag_script)
+        with redirect_stdout(io.StringIO()):
+            result = install_ag_issues.patch_ag_script(cmd, self.test_dir)
+        namespace = {}
+        exec(compile(self.ag_path.read_text(), str(self.ag_path), "exec"), namespace)
+        return result, namespace["COMMAND_STRUCTURE"]
+
+    def test_find_command_structure(self):
+        """Test that the closing brace, last value and keys are found."""
+        ag_script = 'COMMAND_STRUCTURE = {"a": {"b": "}"}}\n'
+
+        end, last, commands = install_ag_issues.find_command_structure(ag_script)
+
+        self.assertEqual(end, len(ag_script) - 2)
+        self.assertEqual(ag_script[:last], 'COMMAND_STRUCTURE = {"a": {"b": "}"}')
+        self.assertEqual(commands, {"a"})
+
+    def test_find_command_structure_after_form_feed(self):
+        """Test that separators other than line endings do not shift offsets."""
+        ag_script = '# Section\x0c\nCOMMAND_STRUCTURE = {"a": 1}\n'
+
+        end, last, _ = install_ag_issues.find_command_structure(ag_script)
+
+        self.assertEqual(ag_script[end], "}")
+        self.assertEqual(ag_script[last - 1], "1")
+
+    def test_find_command_structure_missing(self):
+        """Test that scripts without COMMAND_STRUCTURE are rejected."""
+        self.assertIsNone(install_ag_issues.find_command_structure("COMMANDS = {}\n"))
+        self.assertIsNone(install_ag_issues.find_command_structure("COMMAND_STRUCTURE = {\n"))
+
+    def test_nested_dicts(self):
+        """Test that the command is added after nested command dictionaries."""
+        ag_script = (
+            'COMMAND_STRUCTURE = {\n'
+            '    "tasks": {\n'
+            '        "description": "Tasks {x}",\n'
+            '        "subcommands": {"add": {"module": "tasks"}},\n'
+            '    },\n'
+            '}\n'
+        )
+
+        result, commands = self.patch(ag_script)
+
+        self.assertEqual(result, 0)
+        self.assertEqual(list(commands), ["tasks", "issue"])
+        self.assertEqual(commands["tasks"]["subcommands"], {"add": {"module": "tasks"}})
+        self.assertEqual(commands["issue"]["subcommands"]["list"]["function"], "issue_command")
+        self.assertEqual(self.ag_path.with_suffix(".bak").read_text(), ag_script)
+
+    def test_missing_trailing_comma(self):
+        """Test that a comma is added after a last entry without one."""
+        result, commands = self.patch('COMMAND_STRUCTURE = {\n    "tasks": {"module": "tasks"}\n}\n')
+
+        self.assertEqual(result, 0)
+        self.assertEqual(list(commands), ["tasks", "issue"])
+
+    def test_comment_after_last_entry(self):
+        """Test that a comment after the last entry does not swallow the comma."""
+        result, commands = self.patch('COMMAND_STRUCTURE = {\n    "tasks": {"module": "tasks"}  # tasks, etc.\n}\n')
+
+        self.assertEqual(result, 0)
+        self.assertEqual(list(commands), ["tasks", "issue"])
+
+    def test_empty_command_structure(self):
+        """Test that the command is added to an empty dictionary."""
+        result, commands = self.patch("COMMAND_STRUCTURE = {}\n")
+
+        self.assertEqual(result, 0)
+        self.assertEqual(list(commands), ["issue"])
+
+    def test_existing_command_is_not_added_again(self):
+        """Test that a command already in COMMAND_STRUCTURE is left alone."""
+        ag_script = 'COMMAND_STRUCTURE = {\n    "issue": {"description": "Mine"},\n}\n'
+
+        result, commands = self.patch(ag_script)
+
+        self.assertEqual(result, 0)
+        self.assertEqual(commands, {"issue": {"description": "Mine"}})
+        self.assertEqual(self.ag_path.read_text(), ag_script)
+
+    def test_similar_command_does_not_count_as_installed(self):
+        """Test that an "issues" entry does not stop "issue" from being added."""
+        ag_script = 'COMMAND_STRUCTURE = {\n    "issues": {"function": "issues_command"},\n}\n'
+
+        result, commands = self.patch(ag_script)
+
+        self.assertEqual(result, 0)
+        self.assertEqual(list(commands), ["issues", "issue"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Tests for the models module.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add the src directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from agentic_issues.models import Issue, IssuePriority, IssueStatus
+
+
+class TestIssue(unittest.TestCase):
+    """Tests for the Issue class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.issue = Issue.create(
+            project_id="test-project",
+            title="Test Issue",
+            description="Test Description",
+            author="test-user",
+        )
+
+    def test_create(self):
+        """Test creating an issue."""
+        self.assertEqual(self.issue.status, IssueStatus.OPEN)
+        self.assertEqual(self.issue.priority, IssuePriority.MEDIUM)
+        self.assertEqual(self.issue.labels, [])
+        self.assertIsNone(self.issue.updated_at)
+
+    @unittest.skipIf(sys.version_info < (3, 10), "dataclass slots need Python 3.10")
+    def test_slots(self):
+        """Test that issues and comments have no instance __dict__."""
+        comment = self.issue.add_comment("test-user", "Test Comment")
+
+        self.assertFalse(hasattr(self.issue, "__dict__"))
+        self.assertFalse(hasattr(comment, "__dict__"))
+
+    def test_add_comment(self):
+        """Test adding a comment."""
+        comment = self.issue.add_comment("test-user", "Test Comment")
+
+        self.assertEqual(self.issue.comments, [comment])
+        self.assertEqual(comment.issue_id, self.issue.id)
+        self.assertEqual(self.issue.updated_at, comment.created_at)
+
+    def test_apply_updates(self):
+        """Test applying several updates at once."""
+        changed = self.issue.apply_updates(status=IssueStatus.IN_PROGRESS, assignee="someone", label="bug")
+
+        self.assertEqual(changed, ["status", "assignee", "labels"])
+        self.assertEqual(self.issue.status, IssueStatus.IN_PROGRESS)
+        self.assertEqual(self.issue.priority, IssuePriority.MEDIUM)
+        self.assertEqual(self.issue.assignee, "someone")
+        self.assertEqual(self.issue.labels, ["bug"])
+        self.assertIsNotNone(self.issue.updated_at)
+
+    def test_apply_updates_without_changes(self):
+        """Test that applying no updates leaves the issue untouched."""
+        self.assertEqual(self.issue.apply_updates(), [])
+        self.assertIsNone(self.issue.updated_at)
+
+    def test_apply_updates_with_current_values(self):
+        """Test that updates matching the current values change nothing."""
+        self.issue.labels.append("bug")
+        changed = self.issue.apply_updates(status=self.issue.status, priority=self.issue.priority, label="bug")
+
+        self.assertEqual(changed, [])
+        self.assertEqual(self.issue.labels, ["bug"])
+        self.assertIsNone(self.issue.updated_at)
+
+
+if __name__ == "__main__":
+    unittest.main()
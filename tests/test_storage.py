@@ -0,0 +1,221 @@
+"""
+Tests for the storage module.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the src directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from agentic_issues.models import Issue, IssuePriority, IssueStatus
+from agentic_issues import storage as storage_module
+from agentic_issues.storage import IssueStorage
+
+
+class TestIssueStorage(unittest.TestCase):
+    """Tests for the IssueStorage class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.storage = IssueStorage(self.test_dir)
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def make_issue(self, project_id="test-project", title="Test Issue"):
+        """Create an issue for testing."""
+        return Issue.create(
+            project_id=project_id,
+            title=title,
+            description="Test Description",
+            author="test-user",
+            priority=IssuePriority.HIGH,
+            labels=["bug"],
+        )
+
+    def test_save_and_get_issue(self):
+        """Test that a saved issue can be read back."""
+        issue = self.make_issue()
+        issue.add_comment("test-user", "Test Comment")
+        self.storage.save_issue(issue)
+
+        loaded = self.storage.get_issue("test-project", issue.id)
+
+        self.assertEqual(loaded, issue)
+        self.assertEqual(loaded.status, IssueStatus.OPEN)
+        self.assertEqual(loaded.comments[0].content, "Test Comment")
+
+    def test_save_and_get_issue_without_orjson(self):
+        """Test that issues round-trip through the standard json module."""
+        issue = self.make_issue()
+        issue.add_comment("test-user", "Test Comment")
+
+        with patch("agentic_issues.storage.orjson", None):
+            self.storage.save_issue(issue)
+            loaded = self.storage.get_issue("test-project", issue.id)
+
+        self.assertEqual(loaded, issue)
+        self.assertEqual(self.storage.get_issue("test-project", issue.id), issue)
+
+    def test_save_issue_updates_existing(self):
+        """Test that saving an existing issue replaces it."""
+        issue = self.make_issue()
+        self.storage.save_issue(issue)
+        issue.update_status(IssueStatus.CLOSED)
+        self.storage.save_issue(issue)
+
+        issues = self.storage.get_issues("test-project")
+
+        self.assertEqual(len(issues), 1)
+        self.assertEqual(issues[0].status, IssueStatus.CLOSED)
+
+    def test_save_issues_writes_each_project_once(self):
+        """Test that a batch is written with one file write per project."""
+        batch = [
+            self.make_issue("project-a", "A1"),
+            self.make_issue("project-b", "B1"),
+            self.make_issue("project-a", "A2"),
+        ]
+
+        with patch.object(self.storage, "_write_issues",
+                          wraps=self.storage._write_issues) as write:
+            self.storage.save_issues(batch)
+
+        self.assertEqual(write.call_count, 2)
+        self.assertEqual([i.title for i in self.storage.get_issues("project-a")], ["A1", "A2"])
+        self.assertEqual([i.title for i in self.storage.get_issues("project-b")], ["B1"])
+
+    def test_load_is_cached_until_file_changes(self):
+        """Test that a project file is parsed again only after it changes on disk."""
+        issue = self.make_issue()
+        self.storage.save_issue(issue)
+
+        with patch("agentic_issues.storage._load_json",
+                   wraps=storage_module._load_json) as load:
+            # Written records are cached, and are not shared with the issues
+            first = self.storage.get_issue("test-project", issue.id)
+            first.add_label("changed")
+            second = self.storage.get_issue("test-project", issue.id)
+            self.assertEqual(second.labels, ["bug"])
+
+            self.storage.save_issue(first)
+            self.assertEqual(self.storage.get_issue("test-project", issue.id), first)
+            self.assertEqual(load.call_count, 0)
+
+            # Changes made through another storage instance are picked up
+            other = IssueStorage(self.test_dir)
+            other.get_issues("test-project")
+            first.add_label("other")
+            other.save_issue(first)
+            third = self.storage.get_issue("test-project", issue.id)
+            self.assertEqual(load.call_count, 2)
+            self.assertEqual(third.labels, ["bug", "changed", "other"])
+
+    def test_failed_write_keeps_project_file(self):
+        """Test that a failed write leaves the project file and no temporary file."""
+        issue = self.make_issue()
+        self.storage.save_issue(issue)
+
+        with patch("agentic_issues.storage._dump_issues", side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                self.storage.save_issue(self.make_issue(title="Other"))
+
+        self.assertEqual(sorted(p.name for p in Path(self.test_dir, "issues").iterdir()),
+                         ["test-project.json"])
+        self.assertEqual(IssueStorage(self.test_dir).get_issues("test-project"), [issue])
+
+    @unittest.skipIf(os.name == "nt", "POSIX file permissions")
+    def test_write_file_permissions(self):
+        """Test that new files follow the umask and replaced files keep their mode."""
+        project_file = Path(self.test_dir, "issues", "test-project.json")
+        old_umask = os.umask(0o077)
+        try:
+            self.storage.save_issue(self.make_issue())
+        finally:
+            os.umask(old_umask)
+        self.assertEqual(project_file.stat().st_mode & 0o777, 0o600)
+
+        project_file.chmod(0o640)
+        self.storage.save_issue(self.make_issue(title="Other"))
+        self.assertEqual(project_file.stat().st_mode & 0o777, 0o640)
+
+    def test_query_issues(self):
+        """Test filtering and sorting issues in a query."""
+        low = self.make_issue(title="Low")
+        low.priority = IssuePriority.LOW
+        critical = self.make_issue(title="Critical")
+        critical.priority = IssuePriority.CRITICAL
+        closed = self.make_issue(title="Closed")
+        closed.update_status(IssueStatus.CLOSED)
+        closed.labels = ["ui"]
+        self.storage.save_issues([low, critical, closed])
+
+        by_priority = self.storage.query_issues("test-project", sort="priority")
+        self.assertEqual([i.title for i in by_priority], ["Critical", "Closed", "Low"])
+
+        by_update = self.storage.query_issues("test-project", sort="updated")
+        self.assertEqual(by_update[0].title, "Closed")
+
+        open_bugs = self.storage.query_issues("test-project", status=IssueStatus.OPEN, label="bug")
+        self.assertEqual({i.title for i in open_bugs}, {"Low", "Critical"})
+
+        limited = self.storage.query_issues("test-project", sort="priority", limit=1)
+        self.assertEqual([i.title for i in limited], ["Critical"])
+
+    def test_mutate_issue(self):
+        """Test that mutate_issue saves changed issues only."""
+        issue = self.make_issue()
+        self.storage.save_issue(issue)
+
+        with patch.object(self.storage, "_write_issues",
+                          wraps=self.storage._write_issues) as write:
+            with self.storage.mutate_issue("test-project", issue.id) as mutable:
+                mutable.add_comment("test-user", "Test Comment")
+            with self.storage.mutate_issue("test-project", issue.id) as mutable:
+                pass
+            with self.storage.mutate_issue("test-project", issue.id) as mutable:
+                mutable.title = "Changed Title"
+            with self.storage.mutate_issue("test-project", "missing") as mutable:
+                self.assertIsNone(mutable)
+
+        self.assertEqual(write.call_count, 2)
+        loaded = self.storage.get_issue("test-project", issue.id)
+        self.assertEqual([c.content for c in loaded.comments], ["Test Comment"])
+        self.assertEqual(loaded.title, "Changed Title")
+
+    def test_get_all_issues(self):
+        """Test reading the issues of several projects at once."""
+        self.storage.save_issues([
+            self.make_issue("project-a", "A1"),
+            self.make_issue("project-b", "B1"),
+            self.make_issue("project-a", "A2"),
+        ])
+
+        all_issues = self.storage.get_all_issues()
+        self.assertEqual({p: [i.title for i in issues] for p, issues in all_issues.items()},
+                         {"project-a": ["A1", "A2"], "project-b": ["B1"]})
+
+        some_issues = self.storage.get_all_issues(["project-b", "missing"])
+        self.assertEqual({p: len(issues) for p, issues in some_issues.items()},
+                         {"project-b": 1, "missing": 0})
+
+    def test_delete_issue(self):
+        """Test deleting an issue."""
+        issue = self.make_issue()
+        self.storage.save_issue(issue)
+
+        self.assertTrue(self.storage.delete_issue("test-project", issue.id))
+        self.assertFalse(self.storage.delete_issue("test-project", issue.id))
+        self.assertEqual(self.storage.get_issues("test-project"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()